@@ -0,0 +1,119 @@
+"""Checks that importing InfiniSDK stays lazy, and measures how long it takes.
+
+Runs each statement in a fresh interpreter, and fails if it loaded any module which it
+should leave for later (e.g. the object modules, or heavy dependencies used only by
+specific operations), e.g.::
+
+    PYTHONPATH=. python benchmarks/bench_import_time.py --runs 7 --top 5
+
+The check does not depend on the speed of the machine, so it can guard against
+regressions in CI. The script also reports the median cumulative import time of each
+statement (from ``python -X importtime``, not counting modules which the bare
+interpreter imports on startup), relative to importing ``requests`` on the same
+machine. ``--max-ratio`` turns that ratio into an additional, machine-independent
+threshold. ``--top`` lists the heaviest imports of each statement.
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+# Modules which each statement must not import
+_DEFERRED_MODULES = {
+    "import infinisdk": [
+        "infinisdk.infinibox",
+        "infinisdk.core.system_object",
+        "requests",
+        "arrow",
+        "pkg_resources",
+    ],
+    "from infinisdk import InfiniBox": ["pkg_resources"],
+}
+
+_BASELINE_STATEMENT = "import requests"
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _get_loaded_modules(statement):
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n{}\nprint('\\n'.join(sys.modules))".format(statement),
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    ).stdout
+    return set(output.splitlines())
+
+
+def _get_import_times(statement):
+    """Returns the cumulative import time, in microseconds, of each top-level import"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    ).stderr
+    returned = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is not None and len(match.group(3)) == 1:
+            returned[match.group(4)] = int(match.group(2))
+    return returned
+
+
+def _measure(statement, runs, startup_modules):
+    totals = []
+    for _ in range(runs):
+        import_times = _get_import_times(statement)
+        heaviest = sorted(
+            (
+                (cumulative, module_name)
+                for module_name, cumulative in import_times.items()
+                if module_name not in startup_modules
+            ),
+            reverse=True,
+        )
+        totals.append(sum(cumulative for cumulative, _ in heaviest))
+    return statistics.median(totals) / 1000.0, heaviest
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=None,
+        help="Fails if a statement takes longer than this many times the baseline",
+    )
+    parser.add_argument("--top", type=int, default=0)
+    args = parser.parse_args()
+    startup_modules = set(_get_import_times("pass"))
+    baseline_ms, _ = _measure(_BASELINE_STATEMENT, args.runs, startup_modules)
+    print("{:<35} {:7.1f}ms (baseline)".format(_BASELINE_STATEMENT, baseline_ms))
+    failed = False
+    for statement, deferred_modules in _DEFERRED_MODULES.items():
+        loaded = sorted(set(deferred_modules) & _get_loaded_modules(statement))
+        elapsed_ms, heaviest = _measure(statement, args.runs, startup_modules)
+        ratio = elapsed_ms / baseline_ms
+        exceeded = args.max_ratio is not None and ratio > args.max_ratio
+        failed = failed or exceeded or bool(loaded)
+        print(
+            "{:<35} {:7.1f}ms ({:.2f}x baseline){}".format(
+                statement, elapsed_ms, ratio, " EXCEEDED" if exceeded else ""
+            )
+        )
+        if loaded:
+            print("    imported eagerly: {}".format(", ".join(loaded)))
+        for cumulative, module_name in heaviest[: args.top]:
+            print("    {:<40} {:7.1f}ms".format(module_name, cumulative / 1000.0))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Measures the client-side CPU cost of querying objects, using recorded API traffic.
+
+First record the traffic of a query against a real system::
+
+    PYTHONPATH=. python benchmarks/bench_query_replay.py record volumes.jsonl.gz \\
+        --address ibox1 --port 8080 --username admin --password 123456
+
+Then replay it as many times as needed, on a machine with no access to the system::
+
+    PYTHONPATH=. python benchmarks/bench_query_replay.py replay volumes.jsonl.gz
+
+Replaying skips the network entirely, so the measured time is the SDK's own cost of
+sending requests, decoding responses, constructing objects and translating fields.
+"""
+import argparse
+import time
+
+from infinisdk import InfiniBox
+from infinisdk.core.api.transport import RecordingTransport, ReplayTransport
+
+
+def _query(system, type_name, page_size, field_names):
+    query = system.objects[type_name].find().page_size(page_size)
+    if field_names:
+        query = query.only_fields(field_names)
+    return [obj.get_fields(field_names, from_cache=True) for obj in query]
+
+
+def _get_system(args):
+    address = args.address if args.port is None else (args.address, args.port)
+    return InfiniBox(address, auth=(args.username, args.password))
+
+
+def _record(args):
+    system = _get_system(args)
+    with RecordingTransport(args.recording) as transport:
+        system.api.set_transport(transport)
+        system.login()
+        print("Recorded {} objects".format(len(_query(system, *_get_query_args(args)))))
+
+
+def _replay(args):
+    system = _get_system(args)
+    transport = ReplayTransport(args.recording)
+    system.api.set_transport(transport)
+    system.login()
+    durations = []
+    for _ in range(args.rounds):
+        transport.rewind()
+        start = time.process_time()
+        num_objects = len(_query(system, *_get_query_args(args)))
+        durations.append(time.process_time() - start)
+    print(
+        "{} objects: best {:.1f}ms, mean {:.1f}ms CPU per iteration".format(
+            num_objects,
+            min(durations) * 1000,
+            sum(durations) / len(durations) * 1000,
+        )
+    )
+
+
+def _get_query_args(args):
+    return args.type_name, args.page_size, args.fields
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("recording")
+    parser.add_argument("--address", default="replayed-system")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--type-name", default="volumes")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--fields", nargs="*", default=[])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    if args.mode == "record":
+        _record(args)
+    else:
+        _replay(args)
+
+
+if __name__ == "__main__":
+    main()
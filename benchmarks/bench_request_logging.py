@@ -0,0 +1,93 @@
+"""Measures the per-request CPU overhead of API request/response logging.
+
+Runs the response handling of :class:`infinisdk.core.api.API` over a 1000-object page,
+once with no handler recording TRACE records and once with one, e.g.::
+
+    PYTHONPATH=. python benchmarks/bench_request_logging.py --objects 1000 --rounds 200
+
+With TRACE disabled the response is not decoded (or pretty-printed) for logging, so
+the first figure should be close to the bare cost of building the response object.
+The second figure is the cost every request paid before logging was made lazy.
+"""
+# pylint: disable=protected-access
+import argparse
+import json
+import timeit
+from datetime import timedelta
+
+import logbook
+import requests
+
+from infinisdk import InfiniBox
+from infinisdk.core.api.api import _APICall
+from infinisdk.core.config import config
+
+_URL = "http://infinibox/api/rest/volumes"
+
+
+def _get_page(num_objects):
+    return {
+        "result": [
+            {"id": i, "name": "vol_{}".format(i), "size": 10**9, "type": "MASTER"}
+            for i in range(num_objects)
+        ],
+        "error": None,
+        "metadata": {"ready": True, "page": 1, "page_size": num_objects},
+    }
+
+
+def _get_requests_response(num_objects):
+    prepared = requests.Request("get", _URL).prepare()
+    returned = requests.Response()
+    returned.status_code = 200
+    returned.reason = "OK"
+    returned.request = prepared
+    returned.url = _URL
+    returned.elapsed = timedelta(milliseconds=1)
+    returned._content = json.dumps(_get_page(num_objects)).encode("utf-8")
+    returned.headers["Content-Type"] = "application/json"
+    return returned
+
+
+def _get_api(pretty_json):
+    # A real API object (no requests are sent), so that it is fully initialized
+    with config.backup_context():
+        config.root.api.log.pretty_json = pretty_json
+        config.root.api.json_codec = "stdlib"
+        return InfiniBox("infinibox", auth=("admin", "")).api
+
+
+def _measure(api, response, rounds):
+    api_call = _APICall("get", "volumes")
+    api_call.send_kwargs = {}
+    return (
+        min(
+            timeit.repeat(
+                lambda: api._get_response(api_call, _URL, response, 0, 0),
+                number=rounds,
+                repeat=5,
+            )
+        )
+        / rounds
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--pretty-json", action="store_true", default=False)
+    args = parser.parse_args()
+
+    api = _get_api(args.pretty_json)
+    response = _get_requests_response(args.objects)
+    with logbook.NullHandler():
+        disabled = _measure(api, response, args.rounds)
+        with logbook.Handler(level=logbook.TRACE, bubble=False):
+            enabled = _measure(api, response, args.rounds)
+    print("TRACE disabled: {:.1f}us per request".format(disabled * 10**6))
+    print("TRACE enabled:  {:.1f}us per request".format(enabled * 10**6))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,67 @@
-from .core.q import Q  # pylint: disable=unused-import
-from .infinibox import InfiniBox
-from .infinibox.components import InfiniBoxSystemComponents
+import importlib
+import sys
 
 _SDK_HOOK = "infinidat.sdk.{}".format
 
+# Importing the object modules (and their dependencies) is deferred to first use, since
+# many short-lived scripts only need a small part of the SDK
+_LAZY_ATTRIBUTES = {
+    "Q": ".core.q",
+    "InfiniBox": ".infinibox",
+    "InfiniBoxSystemComponents": ".infinibox.components",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    returned = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = returned
+    return returned
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+class _LazyTagNames:
+    """
+    Hook tags which are only computed when first inspected by gossip, so that defining
+    the hooks does not import the object modules. Computing them imports the object
+    modules explicitly (see :func:`_get_object_tag_names`).
+
+    Gossip inspects the tags of a hook whenever a handler is registered to it (even
+    without tags) or it is triggered. The SDK therefore registers its own handlers only
+    once the object modules are fully imported (at the end of ``infinisdk.infinibox``),
+    and nothing may register to or trigger these hooks while they are being imported
+    """
+
+    def __init__(self, get_tag_names):
+        super(_LazyTagNames, self).__init__()
+        self._get_tag_names = get_tag_names
+        self._tag_names = None
+
+    def _get(self):
+        if self._tag_names is None:
+            self._tag_names = frozenset(self._get_tag_names())
+        return self._tag_names
+
+    def __bool__(self):
+        return True
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __contains__(self, tag):
+        return tag in self._get()
+
+    def __len__(self):
+        return len(self._get())
+
+    def __repr__(self):
+        return repr(set(self._get()))
+
 
 def _get_system_tag_names(system_cls, sdk_classes):
     return set(
@@ -13,20 +71,33 @@ def _get_system_tag_names(system_cls, sdk_classes):
     )
 
 
-def _install_hooks():
-    import gossip
+def _get_object_tag_names():
+    from .infinibox import InfiniBox
 
-    # Define systems objects operation hooks.
-    obj_type_names = _get_system_tag_names(
+    returned = _get_system_tag_names(
         InfiniBox, InfiniBox.OBJECT_TYPES + InfiniBox.SUB_OBJECT_TYPES
     )
-    obj_type_names.add("event")
+    returned.add("event")
+    return returned
+
+
+def _get_update_tag_names():
+    from .infinibox import InfiniBox
+    from .infinibox.components import InfiniBoxSystemComponents
 
     component_type_names = _get_system_tag_names(
         InfiniBox, InfiniBoxSystemComponents.types.to_list()
     )
     # Update is the only action which components can perform (it cannot be created or deleted)
-    update_tag_names = obj_type_names | component_type_names
+    return _get_object_tag_names() | component_type_names
+
+
+def _install_hooks():
+    import gossip
+
+    # Define systems objects operation hooks.
+    obj_type_names = _LazyTagNames(_get_object_tag_names)
+    update_tag_names = _LazyTagNames(_get_update_tag_names)
 
     # pylint: disable=too-many-format-args
     gossip.define(
@@ -546,3 +617,9 @@ def _install_hooks():
 
 
 _install_hooks()
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) is only supported since Python 3.7
+    from .core.q import Q  # pylint: disable=unused-import
+    from .infinibox import InfiniBox
+    from .infinibox.components import InfiniBoxSystemComponents
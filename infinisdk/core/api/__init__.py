@@ -1,3 +1,12 @@
 from .api import API
 from .api_target import APITarget
+from .async_api import AsyncAPI
+from .backoff import (
+    DecorrelatedJitterBackoff,
+    ExponentialBackoff,
+    FixedBackoff,
+    RetryBudget,
+)
+from .batch import APIBatch
+from .executor import APIExecutor
 from .special_values import OMIT, Autogenerate, RawValue
@@ -0,0 +1,84 @@
+import socket
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from ..config import config
+
+_POOL_OPTION_NAMES = (
+    "num_pools",
+    "max_connections_per_host",
+    "block_when_full",
+    "keepalive_idle_seconds",
+    "keepalive_interval_seconds",
+    "keepalive_probes",
+)
+
+
+def _get_keepalive_socket_options(idle_seconds, interval_seconds, probes):
+    returned = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # TCP_KEEPIDLE is called TCP_KEEPALIVE on macOS
+    idle_option = getattr(
+        socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None)
+    )
+    for option, value in [
+        (idle_option, idle_seconds),
+        (getattr(socket, "TCP_KEEPINTVL", None), interval_seconds),
+        (getattr(socket, "TCP_KEEPCNT", None), probes),
+    ]:
+        if option is not None and value is not None:
+            returned.append((socket.IPPROTO_TCP, option, value))
+    return returned
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter with a tunable connection pool and TCP keep-alive for idle connections
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["_socket_options"]
+
+    def __init__(
+        self,
+        keepalive_idle_seconds=None,
+        keepalive_interval_seconds=None,
+        keepalive_probes=None,
+        **kwargs,
+    ):
+        if (
+            keepalive_idle_seconds is None
+            and keepalive_interval_seconds is None
+            and keepalive_probes is None
+        ):
+            self._socket_options = None
+        else:
+            self._socket_options = (
+                HTTPConnection.default_socket_options
+                + _get_keepalive_socket_options(
+                    keepalive_idle_seconds, keepalive_interval_seconds, keepalive_probes
+                )
+            )
+        super(PooledHTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._socket_options is not None:
+            kwargs["socket_options"] = self._socket_options
+        super(PooledHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+
+def get_http_adapter(**overrides):
+    """
+    Creates an HTTP adapter according to ``config.root.api.connection_pool``, with the
+    given options taking precedence over the configuration
+    """
+    pool_config = config.root.api.connection_pool
+    options = {name: getattr(pool_config, name) for name in _POOL_OPTION_NAMES}
+    options.update(overrides)
+    return PooledHTTPAdapter(
+        pool_connections=options["num_pools"],
+        pool_maxsize=options["max_connections_per_host"],
+        pool_block=options["block_when_full"],
+        keepalive_idle_seconds=options["keepalive_idle_seconds"],
+        keepalive_interval_seconds=options["keepalive_interval_seconds"],
+        keepalive_probes=options["keepalive_probes"],
+    )
@@ -2,13 +2,13 @@ import copy
 import json
 import socket
 import sys
+import threading
 from base64 import b64encode
 from contextlib import contextmanager
 from functools import partial
 from http import client as httplib
 from urllib.parse import unquote as unquote_url
 
-import colorama
 import flux
 import gossip
 import requests
@@ -28,7 +28,20 @@ from ..exceptions import (
     RelatedSystemNotFound,
     SystemNotFoundException,
 )
+from ..utils.logs import is_trace_enabled
+from .adapters import get_http_adapter
+from .backoff import FixedBackoff, get_retry_after_seconds
+from .batch import APIBatch
+from .coalescing import RequestCoalescer, get_coalescing_key
+from .executor import APIExecutor
+from .health import AddressHealthTracker
+from .json_codec import get_json_codec
+from .metrics import APIMetrics, get_body_length
+from .response_cache import ResponseCache
+from .session_store import SessionStore
 from .special_values import translate_special_values
+from .throttling import Limit, RequestThrottle
+from .transport import RequestsTransport
 
 _RETRY_REQUESTS_EXCEPTION_TYPES = (
     RequestException,
@@ -41,6 +54,8 @@ _REQUESTS_HTTP_EXCEPTION_TYPES = (
     requests.models.HTTPError,
 )
 
+_IDEMPOTENT_HTTP_METHODS = frozenset(["get", "head", "options"])
+
 _logger = Logger(__name__)
 
 
@@ -65,6 +80,35 @@ def _join_path(url, path):
     return _url
 
 
+def _get_throttle_from_config(throttling_config):
+    limit = None
+    if (
+        throttling_config.rate_per_second is not None
+        or throttling_config.max_in_flight is not None
+    ):
+        limit = Limit(
+            rate=throttling_config.rate_per_second,
+            burst=throttling_config.burst,
+            max_in_flight=throttling_config.max_in_flight,
+        )
+    return RequestThrottle(limit=limit)
+
+
+def _is_connection_failure(exception):
+    if isinstance(exception, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exception, requests.exceptions.ConnectionError) and exception.args:
+        reason = getattr(exception.args[0], "reason", None)
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+    return False
+
+
+def _get_received_length(response, send_kwargs):
+    if send_kwargs.get("stream"):  # don't consume the body on behalf of the caller
+        return int(response.headers.get("Content-Length", 0))
+    return len(response.content)
+
+
 def _approval_preprocessor(approve, request):
     if request.method != "get" and not request.url.path.startswith("/api/internal/"):
         request.url = request.url.set_query_param("approved", str(approve).lower())
@@ -84,18 +128,47 @@ class API:
         self._default_request_timeout = None
         self._interactive = False
         self._auto_retry_predicates = {}
-        self._session = None
+        self._retry_budget = None
+        self._thread_safe = config.root.api.thread_safe
+        self._thread_local = threading.local()
+        self._lock = threading.RLock()
+        self._login_generation = 0
+        self._base_session = None
+        self._connection_pool_options = {}
+        self._session_store = None
+        if config.root.api.session_store.enabled:
+            self.enable_session_store()
+        self._tried_session_restore = False
+        self._transport = RequestsTransport()
+        self._throttle = _get_throttle_from_config(config.root.api.throttling)
+        self._response_cache = None
+        if config.root.api.response_cache.enabled:
+            self.enable_response_cache()
+        self._get_coalescer = (
+            RequestCoalescer() if config.root.api.coalesce_get_requests else None
+        )
         self.reinitialize_session(auth=auth)
         self._urls = [
             self._url_from_address(address, use_ssl)
             for address in target.get_api_addresses()
         ]
         self._active_url = None
+        health_config = config.root.api.address_health
+        self._address_health = AddressHealthTracker(
+            self._urls,
+            failure_threshold=health_config.failure_threshold,
+            reset_seconds=health_config.reset_seconds,
+            latency_ewma_alpha=health_config.latency_ewma_alpha,
+            slow_factor=health_config.slow_factor,
+        )
         self._checked_version = False
         self._no_response_logs = (
             0  # Use counter instead of bool, improves support for coroutines
         )
         self._use_pretty_json = config.root.api.log.pretty_json
+        self._json_codec = get_json_codec(config.root.api.json_codec)
+        #: Latency and throughput of the requests sent, see :class:`.APIMetrics`
+        self.metrics = APIMetrics(enabled=config.root.api.collect_metrics)
         self._login_refresh_enabled = True
         self._disabled_http_methods = set()
 
@@ -133,8 +206,56 @@ class API:
         finally:
             self._check_version_compatibility = prev
 
+    def enable_thread_safety(self):
+        """Makes this API object safe for use from multiple threads at once.
+
+        Each thread sends its requests through its own session (sharing the cookie jar
+        and the connection pools), :meth:`added_headers_context` only affects the
+        calling thread, and threads hitting an expired cookie trigger a single re-login
+        """
+        self._thread_safe = True
+
+    def disable_thread_safety(self):
+        """Stops using per-thread sessions and header overlays"""
+        self._thread_safe = False
+
+    def is_thread_safe(self):
+        """Returns whether thread-safe mode is enabled"""
+        return self._thread_safe
+
+    @property
+    def _session(self):
+        if not self._thread_safe:
+            return self._base_session
+        thread_local = self._thread_local
+        if getattr(thread_local, "base_session", None) is not self._base_session:
+            base_session = self._base_session
+            session = requests.Session()
+            session.cookies = base_session.cookies
+            session.headers = base_session.headers
+            session.verify = base_session.verify
+            session.cert = base_session.cert
+            session.adapters = base_session.adapters
+            thread_local.session = session
+            thread_local.base_session = base_session
+        return thread_local.session
+
+    def _get_headers_overlays(self):
+        returned = getattr(self._thread_local, "headers_overlays", None)
+        if returned is None:
+            returned = self._thread_local.headers_overlays = []
+        return returned
+
     @contextmanager
     def added_headers_context(self, headers):
+        if self._thread_safe:
+            overlays = self._get_headers_overlays()
+            overlays.append(dict(headers))
+            try:
+                yield
+            finally:
+                overlays.pop()
+            return
         prev = self._session.headers.copy()
         try:
             for k, v in headers.items():
@@ -171,9 +292,9 @@ class API:
         return cloned_session
 
     def __del__(self):
-        if self._session is not None:
+        if getattr(self, "_base_session", None) is not None:
             try:
-                self._session.close()
+                self._base_session.close()
             except ReferenceError:
                 pass
 
@@ -181,18 +302,19 @@ class API:
         prev_auth = self._auth
         if auth is None:
             auth = self._auth
-        if self._session is not None:
-            prev_cookies = self._session.cookies.copy()
-            self._session.close()
+        if self._base_session is not None:
+            prev_cookies = self._base_session.cookies.copy()
+            self._base_session.close()
         else:
             prev_cookies = None
         was_logged_in = self.is_logged_in()
-        self._session = requests.Session()
+        self._base_session = requests.Session()
+        self._mount_http_adapters()
 
-        assert self._session.cert is None
-        self._session.cert = self._ssl_cert
+        assert self._base_session.cert is None
+        self._base_session.cert = self._ssl_cert
         if not self._ssl_cert:
-            self._session.verify = False
+            self._base_session.verify = False
         self.set_auth(auth, login=False)
 
         if prev_auth == auth and prev_cookies is not None:
@@ -200,6 +322,133 @@ class API:
             if was_logged_in:
                 self.mark_logged_in()
 
+    def set_connection_pool_options(self, **options):
+        """Overrides the settings of ``config.root.api.connection_pool`` for this system
+        only, e.g.:
+
+        >>> system.api.set_connection_pool_options(max_connections_per_host=32)
+        """
+        self._connection_pool_options.update(options)
+        self._mount_http_adapters()
+
+    def _mount_http_adapters(self):
+        adapter = get_http_adapter(**self._connection_pool_options)
+        for prefix in ("http://", "https://"):
+            self._base_session.mount(prefix, adapter)
+
+    def set_transport(self, transport):
+        """Sets the transport sending prepared requests, e.g. to record API traffic or to
+        replay it without a system:
+
+        >>> from infinisdk.core.api.transport import ReplayTransport
+        >>> system.api.set_transport(ReplayTransport('volumes.jsonl.gz'))
+
+        :returns: the previous transport
+        """
+        returned = self._transport
+        self._transport = transport
+        return returned
+
+    def get_transport(self):
+        return self._transport
+
+    def set_throttling(
+        self, rate=None, burst=None, max_in_flight=None, method_limits=None
+    ):
+        """Limits the requests sent to this system. Requests exceeding the limits wait
+        until they are allowed, in all threads and in :class:`.AsyncAPI`:
+
+        >>> system.api.set_throttling(rate=50, max_in_flight=8,
+        ...                           method_limits={'post': dict(rate=5)})
+
+        :param rate: maximum requests per second, on average
+        :param burst: number of requests which may exceed ``rate`` at once
+        :param max_in_flight: maximum number of requests awaiting a response
+        :param method_limits: a dict mapping HTTP methods to dicts of additional
+          ``rate``, ``burst`` and ``max_in_flight`` limits for that method
+        """
+        limit = None
+        if rate is not None or max_in_flight is not None:
+            limit = Limit(rate=rate, burst=burst, max_in_flight=max_in_flight)
+        self._throttle = RequestThrottle(
+            limit=limit,
+            method_limits={
+                http_method: Limit(**kwargs)
+                for http_method, kwargs in (method_limits or {}).items()
+            },
+        )
+
+    def enable_response_cache(self, ttl_seconds=None, max_entries=None):
+        """Caches successful ``GET`` responses for ``ttl_seconds``. Cached responses
+        are discarded by any other request to an overlapping path, sent through this
+        API object (changes made by other clients are only noticed once responses
+        expire). Defaults are taken from ``config.root.api.response_cache``
+        """
+        cache_config = config.root.api.response_cache
+        if ttl_seconds is None:
+            ttl_seconds = cache_config.ttl_seconds
+        if max_entries is None:
+            max_entries = cache_config.max_entries
+        self._response_cache = ResponseCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
+
+    def disable_response_cache(self):
+        self._response_cache = None
+
+    def get_response_cache(self):
+        """Returns the :class:`.ResponseCache` in use, or None if disabled"""
+        return self._response_cache
+
+    def enable_get_coalescing(self):
+        """Makes identical ``GET`` requests sent concurrently (same URL, credentials and
+        headers) share a single request to the system
+        """
+        if self._get_coalescer is None:
+            self._get_coalescer = RequestCoalescer()
+
+    def disable_get_coalescing(self):
+        self._get_coalescer = None
+
+    def is_get_coalescing_enabled(self):
+        return self._get_coalescer is not None
+
+    def _send(self, prepared, send_kwargs, attempt_timing=None):
+        coalescer = self._get_coalescer
+        if (
+            coalescer is not None
+            and prepared.method == "GET"
+            and not send_kwargs.get("stream")
+        ):
+            return coalescer.send(
+                get_coalescing_key(prepared),
+                partial(self._send_throttled, prepared, send_kwargs, attempt_timing),
+            )
+        return self._send_throttled(prepared, send_kwargs, attempt_timing)
+
+    def _send_throttled(self, prepared, send_kwargs, attempt_timing=None):
+        if not self._throttle.is_active():
+            return self._transport.send(self._session, prepared, **send_kwargs)
+        with self._throttle.acquire(prepared.method) as queue_seconds:
+            self.metrics.record_queue_delay(
+                prepared.method, prepared.path_url, queue_seconds
+            )
+            if attempt_timing is not None:
+                # Waiting for the throttle is not part of the request's latency
+                attempt_timing.restart()
+            return self._transport.send(self._session, prepared, **send_kwargs)
+
+    def set_json_codec(self, name):
+        """Sets the JSON codec used to encode requests and decode responses of this
+        system, overriding ``config.root.api.json_codec``:
+
+        >>> system.api.set_json_codec('orjson')
+        """
+        self._json_codec = get_json_codec(name)
+
+    def get_json_codec(self):
+        return self._json_codec
+
     @property
     def urls(self):
         return list(self._urls)
@@ -254,6 +503,50 @@ class API:
     def set_request_default_timeout(self, timeout_seconds):
         self._default_request_timeout = timeout_seconds
 
+    def enable_session_store(self, directory=None):
+        """Saves the session cookies of this system to the disk after logging in, so
+        that other processes using the same credentials can send requests without
+        logging in (see :meth:`restore_saved_session`). Defaults to
+        ``config.root.api.session_store.directory``
+        """
+        if directory is None:
+            directory = config.root.api.session_store.directory
+        self._session_store = SessionStore(directory)
+
+    def disable_session_store(self):
+        self._session_store = None
+
+    def restore_saved_session(self):
+        """Loads the session cookies saved by a previous login with the current
+        credentials, if the session store is enabled. This is done before the first
+        request when :meth:`.InfiniBox.login` was not called, and only once per
+        credentials, so that an expired session leads to a regular login.
+
+        :returns: whether a saved session was loaded
+        """
+        if (
+            self._session_store is None
+            or self._auth is None
+            or self._tried_session_restore
+        ):
+            return False
+        self._tried_session_restore = True
+        cookies = self._session_store.load(self._urls, self._auth)
+        if cookies is None:
+            return False
+        _logger.debug("Restoring saved session of {}", self._auth[0])
+        self.load_credentials(cookies)
+        return True
+
+    def save_session(self):
+        """Saves the current session cookies, if the session store is enabled"""
+        if self._session_store is not None and self._auth is not None:
+            self._session_store.save(self._urls, self._auth, self._session.cookies)
+
+    def discard_saved_session(self):
+        if self._session_store is not None and self._auth is not None:
+            self._session_store.discard(self._urls, self._auth)
+
     def is_logged_in(self):
         return self._is_logged_in
 
@@ -263,6 +556,10 @@ class API:
     def mark_not_logged_in(self):
         self._is_logged_in = False
 
+    def mark_version_unchecked(self):
+        """Causes the version compatibility to be checked again before the next request"""
+        self._checked_version = False
+
     def set_auth(self, username_or_auth, password=NOTHING, login=True):
         """
         Sets the username and password under which operations will be performed
@@ -285,6 +582,7 @@ class API:
                     raise TypeError("Password not specified")
                 username = username_or_auth
             self._auth = (username, password)
+        self._tried_session_restore = False
         self.clear_cookies()
         self.mark_not_logged_in()
         if login:
@@ -335,150 +633,249 @@ class API:
 
         :returns: :class:`.Response`
         """
-        check_version = kwargs.pop("check_version", True)
+        self._prepare_for_request(path, kwargs.pop("check_version", True))
+        api_call = self._get_api_call(http_method, path, kwargs)
+
+        returned = failure = None
+        for url in self._get_possible_urls(
+            api_call.specified_address, api_call.http_method
+        ):
+            api_request, prepared = self._prepare_api_request(api_call, url)
+            gossip.trigger("infinidat.sdk.before_api_request", request=prepared)
+            attempt_timing = _AttemptTiming()
+            try:
+                response = self._send(prepared, api_call.send_kwargs, attempt_timing)
+            except _RETRY_REQUESTS_EXCEPTION_TYPES as e:  # pylint: disable=catching-non-exception
+                failure = self._get_transport_failure(
+                    api_call, url, api_request, attempt_timing.start_time, e
+                )
+                if self._should_try_next_url(api_call, e):
+                    failure.__cause__ = e
+                    continue
+                raise failure from e
+
+            end_time = flux.current_timeline.time()
+            gossip.trigger(
+                "infinidat.sdk.after_api_request", request=prepared, response=response
+            )
+            returned = self._get_response(
+                api_call, url, response, attempt_timing.start_time, end_time
+            )
+            if returned.status_code != httplib.SERVICE_UNAVAILABLE:
+                break
+        if returned is None:
+            raise failure
+        return returned
+
+    def _restore_saved_session_before_request(self, path):
+        # Explicit logins always verify the credentials, other requests may reuse a
+        # session saved by another process. This must happen before the request state
+        # is captured, so that an expired restored session leads to a login
+        if (
+            not self._tried_session_restore
+            and not self._is_logged_in
+            and "login" not in path
+        ):
+            with self._lock:
+                self.restore_saved_session()
+
+    def _after_successful_request(self, path):
+        # Bootstrap information loaded from the disk is only validated after logging
+        # in, which processes reusing a saved session or logging in implicitly skip
+        compat = getattr(self.system, "compat", None)
+        if (
+            compat is None
+            or "login" in path
+            or not compat.needs_bootstrap_cache_validation()
+        ):
+            return
+        with self._lock:
+            if compat.needs_bootstrap_cache_validation():
+                compat.validate_bootstrap_cache()
+
+    def _prepare_for_request(self, path, check_version):
         if (
             check_version
             and self._check_version_compatibility
             and not self._checked_version
             and config.root.check_version_compatibility
         ):
-            self._checked_version = True
-            try:
-                with self.use_basic_auth_context():
-                    self.system.check_version()
-            except Exception:  # pylint: disable=broad-except
-                self._checked_version = False
-                raise
+            with self._lock:
+                if not self._checked_version:
+                    self._checked_version = True
+                    try:
+                        with self.use_basic_auth_context():
+                            self.system.check_version()
+                    except Exception:  # pylint: disable=broad-except
+                        self._checked_version = False
+                        raise
 
-        returned = None
-        kwargs.setdefault("timeout", self._default_request_timeout)
-        auth = None
-
-        if hasattr(self.system, "compat"):
-            if path != "_features":
-                if not self.system.compat.is_initialized():
-                    with self.disable_version_checking_context():
-                        self.system.compat.initialize()
-            if (
-                self._use_basic_auth
-                or not self.system.compat.is_initialized()
-                or not self.system.compat.has_auth_sessions()
-            ):
-                auth = self._auth
+        if hasattr(self.system, "compat") and path != "_features":
+            if not self.system.compat.is_initialized():
+                with self._lock, self.disable_version_checking_context():
+                    self.system.compat.initialize()
+
+    def _get_request_auth(self):
+        if hasattr(self.system, "compat") and (
+            self._use_basic_auth
+            or not self.system.compat.is_initialized()
+            or not self.system.compat.has_auth_sessions()
+        ):
+            return self._auth
+        return None
 
+    def _get_api_call(self, http_method, path, kwargs):
+        api_call = _APICall(http_method, path)
+        api_call.auth = self._get_request_auth()
         raw_data = kwargs.pop("raw_data", False)
-        data = kwargs.pop("data", NOTHING)
-        sent_json_object = None
+        api_call.data = kwargs.pop("data", NOTHING)
         headers = kwargs.pop("headers", None)
-        files = kwargs.pop("files", None)
-        if headers is None:
-            headers = {}
-        else:
-            headers = headers.copy()
-
-        if data is not NOTHING:
-            headers["Content-type"] = "application/json"
+        api_call.headers = {}
+        if self._thread_safe:
+            for overlay in self._get_headers_overlays():
+                api_call.headers.update(overlay)
+        if headers is not None:
+            api_call.headers.update(headers)
+        api_call.files = kwargs.pop("files", None)
+
+        if api_call.data is not NOTHING:
+            api_call.headers["Content-type"] = "application/json"
             if raw_data:
-                sent_json_object = data
+                api_call.sent_json_object = api_call.data
             else:
-                data = translate_special_values(data)
-                sent_json_object = data
-                data = json.dumps(data)
+                api_call.sent_json_object = translate_special_values(api_call.data)
+                api_call.data = self._json_codec.dumps(api_call.sent_json_object)
         else:
             assert raw_data is False, "Cannot handle raw_data with no data"
 
         url_params = kwargs.pop("params", None)
         if url_params is not None:
             url_params = translate_special_values(url_params)
+        api_call.url_params = url_params
 
-        specified_address = kwargs.pop("address", None)
-        urls = self._get_possible_urls(specified_address)
+        api_call.specified_address = kwargs.pop("address", None)
+        kwargs.setdefault("timeout", self._default_request_timeout)
+        api_call.send_kwargs = kwargs
+        return api_call
 
-        for url in urls:
-            full_url = _join_path(url, URL(path))
+    def _prepare_api_request(self, api_call, url):
+        http_method = api_call.http_method
+        data = api_call.data
+        full_url = _join_path(url, URL(api_call.path))
 
-            if (
-                http_method != "get"
-                and not self._interactive
-                and not path.startswith("/api/internal/")
-            ):
-                full_url = self._with_approved(full_url)
-
-            hostname = full_url.hostname
-            api_request = requests.Request(
-                http_method,
-                full_url,
-                data=data if data is not NOTHING else None,
-                params=url_params,
-                headers=headers,
-                auth=auth,
-                files=files,
-            )
-            for preprocessor in self._preprocessors:
-                preprocessor(api_request)
+        if (
+            http_method != "get"
+            and not self._interactive
+            and not api_call.path.startswith("/api/internal/")
+        ):
+            full_url = self._with_approved(full_url)
+
+        hostname = full_url.hostname
+        api_request = requests.Request(
+            http_method,
+            full_url,
+            data=data if data is not NOTHING else None,
+            params=api_call.url_params,
+            headers=api_call.headers,
+            auth=api_call.auth,
+            files=api_call.files,
+        )
+        for preprocessor in self._preprocessors:
+            preprocessor(api_request)
+
+        _logger.trace("{} <-- {} {}", hostname, http_method.upper(), api_request.url)
+        if data is not NOTHING and is_trace_enabled(_logger):
+            sent_json_object = api_call.sent_json_object
+            if data != api_request.data:
+                sent_json_object = self._json_codec.loads(api_request.data)
+            self._log_sent_data(hostname, data, sent_json_object)
+
+        return api_request, self._session.prepare_request(api_request)
+
+    def _should_try_next_url(self, api_call, exception):
+        # Requests which may have reached the system are not resent, unless idempotent
+        return (
+            api_call.http_method.lower() in _IDEMPOTENT_HTTP_METHODS
+            or _is_connection_failure(exception)
+        )
 
-            _logger.trace(
-                "{} <-- {} {}", hostname, http_method.upper(), api_request.url
+    def _get_transport_failure(self, api_call, url, api_request, start_time, exception):
+        request_kwargs = dict(
+            url=api_call.path, method=api_call.http_method, **api_call.send_kwargs
+        )
+        _logger.debug(
+            "Exception while sending API command to {}: {}", self.system, exception
+        )
+        self._address_health.record_failure(url)
+        self.metrics.record(
+            api_call.http_method,
+            api_request.url,
+            flux.current_timeline.time() - start_time,
+            bytes_sent=get_body_length(api_request.data),
+        )
+        error_str = str(exception).lower()
+        if any(
+            substring in error_str
+            for substring in (
+                "gaierror",
+                "nodename nor servname",
+                "name or service not known",
+                "temporary failure in name resolution",
             )
-            if data is not NOTHING:
-                if data != api_request.data:
-                    sent_json_object = json.loads(api_request.data)
-                self._log_sent_data(hostname, data, sent_json_object)
-
-            prepared = self._session.prepare_request(api_request)
-            gossip.trigger("infinidat.sdk.before_api_request", request=prepared)
-            start_time = flux.current_timeline.time()
-            try:
-                response = self._session.send(prepared, **kwargs)
-            except _RETRY_REQUESTS_EXCEPTION_TYPES as e:  # pylint: disable=catching-non-exception
-                request_kwargs = dict(url=path, method=http_method, **kwargs)
-                _logger.debug(
-                    "Exception while sending API command to {}: {}", self.system, e
-                )
-                error_str = str(e).lower()
-                if any(
-                    substring in error_str
-                    for substring in (
-                        "gaierror",
-                        "nodename nor servname",
-                        "name or service not known",
-                        "temporary failure in name resolution",
-                    )
-                ):
-                    raise SystemNotFoundException(e, api_request, start_time) from e
-                raise APITransportFailure(
-                    self.system, request_kwargs, e, api_request, start_time
-                ) from e
+        ):
+            return SystemNotFoundException(exception, api_request, start_time)
+        return APITransportFailure(
+            self.system, request_kwargs, exception, api_request, start_time
+        )
 
-            end_time = flux.current_timeline.time()
-            gossip.trigger(
-                "infinidat.sdk.after_api_request", request=prepared, response=response
-            )
+    def _get_response(self, api_call, url, response, start_time, end_time):
+        hostname = URL(url).hostname
+        elapsed = response.elapsed.total_seconds()
+        if response.status_code == httplib.SERVICE_UNAVAILABLE:
+            self._address_health.record_failure(url)
+        else:
+            self._address_health.record_success(url, end_time - start_time)
+        _logger.trace(
+            "{} --> {} {} (took {:.04f}s)",
+            hostname,
+            response.status_code,
+            response.reason,
+            elapsed,
+        )
+        returned = Response(
+            response,
+            api_call.data,
+            start_time,
+            end_time,
+            json_codec=self._json_codec,
+        )
+        self.metrics.record(
+            api_call.http_method,
+            response.request.path_url,
+            end_time - start_time,
+            status_code=response.status_code,
+            bytes_sent=get_body_length(response.request.body),
+            bytes_received=_get_received_length(response, api_call.send_kwargs),
+        )
+        if is_trace_enabled(_logger):
+            self._log_response_data(hostname, returned)
+        if (
+            response.status_code != httplib.SERVICE_UNAVAILABLE
+            and api_call.specified_address is None
+        ):  # need to remember our next API target
+            self._active_url = url
+        return returned
 
-            elapsed = response.elapsed.total_seconds()
-            _logger.trace(
-                "{} --> {} {} (took {:.04f}s)",
-                hostname,
-                response.status_code,
-                response.reason,
-                elapsed,
-            )
-            returned = Response(response, data, start_time, end_time)
-            resp_data = returned.get_json()
-            if self._no_response_logs:
-                logged_response_data = "..."
-            elif self._use_pretty_json and resp_data is not None:
+    def _log_response_data(self, hostname, returned):
+        if self._no_response_logs:
+            logged_response_data = "..."
+        else:
+            logged_response_data = returned.get_json()
+            if self._use_pretty_json and logged_response_data is not None:
                 logged_response_data = json.dumps(
-                    resp_data, indent=4, separators=(",", ": ")
+                    logged_response_data, indent=4, separators=(",", ": ")
                 )
-            else:
-                logged_response_data = resp_data
-            _logger.trace("{} --> {}", hostname, logged_response_data)
-            if response.status_code != httplib.SERVICE_UNAVAILABLE:
-                if specified_address is None:  # need to remember our next API target
-                    self._active_url = url
-                break
-        return returned
+        _logger.trace("{} --> {}", hostname, logged_response_data)
 
     def _log_sent_data(self, hostname, data, sent_json_object):
         try:
@@ -541,14 +938,29 @@ class API:
         finally:
             self._no_response_logs -= 1
 
-    def add_auto_retry(self, retry_predicate, max_retries=1, sleep_seconds=None):
-        if sleep_seconds is None:  # backwards compatibility
-            sleep_seconds = config.root.defaults.retry_sleep_seconds
+    def add_auto_retry(
+        self, retry_predicate, max_retries=1, sleep_seconds=None, backoff=None
+    ):
+        """Retries requests failing with exceptions matching ``retry_predicate``
+
+        :param sleep_seconds: a fixed sleep between retries
+        :param backoff: a :class:`.Backoff` deciding the sleep before each retry, e.g.
+          :class:`.ExponentialBackoff`. Cannot be used along with ``sleep_seconds``
+        """
+        if backoff is None:
+            if sleep_seconds is None:  # backwards compatibility
+                sleep_seconds = config.root.defaults.retry_sleep_seconds
+            backoff = FixedBackoff(sleep_seconds)
+        else:
+            assert sleep_seconds is None, "Cannot use both sleep_seconds and backoff"
         assert retry_predicate not in self._auto_retry_predicates
         _logger.debug(
-            "Add auto-retry predicate {} for {} retries", retry_predicate, max_retries
+            "Add auto-retry predicate {} for {} retries ({})",
+            retry_predicate,
+            max_retries,
+            backoff,
         )
-        self._auto_retry_predicates[retry_predicate] = (max_retries, sleep_seconds)
+        self._auto_retry_predicates[retry_predicate] = (max_retries, backoff)
 
     def remove_auto_retry(self, retry_predicate):
         _logger.debug("Remove auto-retry predicate {}", retry_predicate)
@@ -557,8 +969,21 @@ class API:
     def is_auto_retry_active(self, retry_predicate):
         return retry_predicate in self._auto_retry_predicates
 
+    def set_retry_budget(self, retry_budget):
+        """Limits the auto-retries of all requests to this system, e.g.:
+
+        >>> from infinisdk.core.api.backoff import RetryBudget
+        >>> system.api.set_retry_budget(RetryBudget(max_retries=100, period_seconds=60))
+
+        :param retry_budget: a :class:`.RetryBudget`, or None for unlimited retries
+        """
+        self._retry_budget = retry_budget
+
+    def get_retry_budget(self):
+        return self._retry_budget
+
     def _get_auto_retries_context(self):
-        return _AutoRetryContext(self._auto_retry_predicates)
+        return _AutoRetryContext(self._auto_retry_predicates, self._retry_budget)
 
     def set_cookie(self, cookie, value):
         self._session.cookies[cookie] = value
@@ -571,73 +996,36 @@ class API:
 
     def request(self, http_method, path, assert_success=True, **kwargs):
         """Sends HTTP API request to the remote system"""
-        if http_method in self._disabled_http_methods:
-            raise MethodDisabled(
-                'Request "{} {}" aborted, method is disabled'.format(
-                    http_method.upper(), path
-                )
-            )
-        did_interactive_confirmation = False
-        did_login = False
-        had_cookies = bool(self._session.cookies)
+        self._assert_method_enabled(http_method, path)
+        send = partial(
+            self._request_with_retries, http_method, path, assert_success, kwargs
+        )
+        if self._response_cache is None:
+            return send()
+        return self._response_cache.request(self._auth, http_method, path, kwargs, send)
+
+    def _request_with_retries(self, http_method, path, assert_success, kwargs):
+        self._restore_saved_session_before_request(path)
+        state = _RequestState(
+            had_cookies=bool(self._session.cookies),
+            login_generation=self._login_generation,
+        )
         auto_retries_context = self._get_auto_retries_context()
         while True:
             with auto_retries_context:
                 returned = self._request(http_method, path, **kwargs)
 
-                if (
-                    returned.status_code == requests.codes.unauthorized
-                    and self._login_refresh_enabled
-                    and had_cookies
-                    and not did_login
-                    and "login" not in path
-                ):
-
-                    _logger.trace(
-                        "Performing login again due to expired cookie ({})",
-                        self._session.cookies,
-                    )
-                    self.mark_not_logged_in()
-                    self.system.login()
-                    did_login = True
+                if self._should_refresh_login(returned, path, state):
+                    self._refresh_login(state)
                     continue
 
                 if assert_success:
-                    try:
-                        returned.assert_success()
-                    except APICommandFailed as e:
-                        if self._is_approval_required(e):
-                            reason = self._get_unapproved_reason(
-                                e.response.response.json()
-                            )
-                            if self._interactive and not did_interactive_confirmation:
-                                did_interactive_confirmation = True
-                                if self._ask_approval_interactively(
-                                    http_method, path, reason
-                                ):
-                                    path = self._with_approved(path)
-                                    continue
-                                raise CommandNotApproved(e.response, reason) from e
-                        if (e.status_code == 403) and (
-                            e.error_code == "REMOTE_PERMISSION_REQUIRED"
-                        ):
-                            try:
-                                (
-                                    related_user,
-                                    related_password,
-                                ) = self._get_related_system_auth()
-                                self._session.headers[
-                                    "X-Remote-Authorization"
-                                ] = b"Basic " + b64encode(
-                                    f"{related_user}:{related_password}".encode()
-                                )
-                                continue
-                            except TypeError as e:
-                                raise RelatedSystemNotFound(
-                                    "There are no "
-                                    "related systems registered to get the auth from"
-                                ) from e
-                        raise
+                    retry_path = self._get_retry_path_on_failure(
+                        http_method, path, returned, state
+                    )
+                    if retry_path is not None:
+                        path = retry_path
+                        continue
                 deprecation_header = returned.response.headers.get(
                     "x-infinidat-deprecated-api"
                 )
@@ -646,9 +1034,100 @@ class API:
                         "Deprecation warning: {}".format(deprecation_header),
                         frame_correction=2,
                     )
+                if returned.response.ok:
+                    self._after_successful_request(path)
                 return returned
         assert False, "Should never get here!"  # pragma: no cover
 
+    def batch(self, max_parallel=16):
+        """Returns an :class:`.APIBatch` context, sending the requests made through it
+        concurrently::
+
+            with system.api.batch(max_parallel=16) as batch:
+                for volume in volumes:
+                    batch.post('metadata/{}'.format(volume.id), data={'key': 'value'})
+
+        .. note:: Consider :meth:`enable_thread_safety` and tuning the connection pool
+          (``config.root.api.connection_pool``) when using a high degree of parallelism
+        """
+        return APIBatch(self, max_parallel=max_parallel)
+
+    def get_executor(self, max_workers):
+        """Returns an :class:`.APIExecutor`, a thread pool whose tasks send their requests
+        with the headers added (by :meth:`added_headers_context`) in the submitting thread
+        """
+        return APIExecutor(self, max_workers=max_workers)
+
+    def _assert_method_enabled(self, http_method, path):
+        if http_method in self._disabled_http_methods:
+            raise MethodDisabled(
+                'Request "{} {}" aborted, method is disabled'.format(
+                    http_method.upper(), path
+                )
+            )
+
+    def _should_refresh_login(self, returned, path, state):
+        return (
+            returned.status_code == requests.codes.unauthorized
+            and self._login_refresh_enabled
+            and state.had_cookies
+            and not state.did_login
+            and "login" not in path
+        )
+
+    def _refresh_login(self, state):
+        with self._lock:
+            # Only one of the requests that hit the expired cookie needs to login again
+            if self._login_generation == state.login_generation:
+                _logger.trace(
+                    "Performing login again due to expired cookie ({})",
+                    self._session.cookies,
+                )
+                self.mark_not_logged_in()
+                self._tried_session_restore = True
+                self.discard_saved_session()
+                # The expired cookies must not be sent by the requests made while
+                # logging in (e.g. fetching the features of a restored session)
+                self._session.cookies.clear()
+                self.system.login()
+                self._login_generation += 1
+        state.did_login = True
+
+    def _get_retry_path_on_failure(self, http_method, path, returned, state):
+        """Returns the path to retry the request with, or None if it succeeded"""
+        try:
+            returned.assert_success()
+        except APICommandFailed as e:
+            if self._is_approval_required(e):
+                reason = self._get_unapproved_reason(e.response.get_json())
+                if self._interactive and not state.did_interactive_confirmation:
+                    state.did_interactive_confirmation = True
+                    if self._ask_approval_interactively(http_method, path, reason):
+                        return self._with_approved(path)
+                    raise CommandNotApproved(e.response, reason) from e
+            if (e.status_code == 403) and (
+                e.error_code == "REMOTE_PERMISSION_REQUIRED"
+            ):
+                try:
+                    (
+                        related_user,
+                        related_password,
+                    ) = self._get_related_system_auth()
+                    with self._lock:
+                        self._session.headers[
+                            "X-Remote-Authorization"
+                        ] = b"Basic " + b64encode(
+                            f"{related_user}:{related_password}".encode()
+                        )
+                    return path
+                except TypeError as e:
+                    raise RelatedSystemNotFound(
+                        "There are no "
+                        "related systems registered to get the auth from"
+                    ) from e
+            raise
+        return None
+
     def _get_related_system_auth(self):
         for related_system in self.system.iter_related_systems():
             if related_system is not None:
@@ -662,6 +1141,8 @@ class API:
             reason = "API operation requires approval: {} {}".format(method, path)
         msg = "{} Approve? [y/N] ".format(reason)
         if sys.stdout.isatty():
+            import colorama
+
             msg = colorama.Fore.YELLOW + msg + colorama.Fore.RESET
         # note: call through module to allow stubbing
         return input(msg).strip().lower() in ["yes", "y"]
@@ -684,15 +1165,20 @@ class API:
                 return error.get("message")
         return None
 
-    def _get_possible_urls(self, address=None):
+    def _get_possible_urls(self, address=None, http_method="get"):
 
         if address is not None:
             return [self._url_from_address(address, self._use_ssl)]
 
-        if self._active_url is not None:
-            return [self._active_url]
+        # Only requests which fail over to the next address may probe a skipped one
+        return self._address_health.get_ordered_urls(
+            preferred_url=self._active_url,
+            probe=http_method.lower() in _IDEMPOTENT_HTTP_METHODS,
+        )
 
-        return self._urls
+    def get_address_health(self):
+        """Returns the health of each management address, ordered by preference"""
+        return self._address_health.get_healths(preferred_url=self._active_url)
 
     def _url_from_address(self, address, use_ssl):
         hostname, port = address
@@ -706,7 +1192,7 @@ class Response:
     System API request response
     """
 
-    def __init__(self, resp, data, start_timestamp, end_timestamp):
+    def __init__(self, resp, data, start_timestamp, end_timestamp, json_codec=None):
         super(Response, self).__init__()
         self.method = resp.request.method
         #: Response object as returned from ``requests``
@@ -716,6 +1202,7 @@ class Response:
         #: Data sent to on
         self.sent_data = data
         self._cached_json = NOTHING
+        self._json_codec = json_codec
         self.start_time = start_timestamp
         self.end_time = end_timestamp
 
@@ -730,7 +1217,10 @@ class Response:
         returned = self._cached_json
         if returned is NOTHING:
             try:
-                returned = self.response.json()
+                if self._json_codec is None:
+                    returned = self.response.json()
+                else:
+                    returned = self._json_codec.loads(self.response.content)
             except (ValueError, TypeError):
                 returned = None
             self._cached_json = returned
@@ -786,10 +1276,51 @@ class Response:
             APICommandFailed.raise_from_response(self)
 
 
+class _APICall:
+    """
+    Holds the parameters of a single API call, shared by all of its attempts
+    """
+
+    def __init__(self, http_method, path):
+        self.http_method = http_method
+        self.path = path
+        self.auth = None
+        self.data = NOTHING
+        self.sent_json_object = None
+        self.headers = None
+        self.files = None
+        self.url_params = None
+        self.specified_address = None
+        self.send_kwargs = None
+
+
+class _AttemptTiming:
+    """
+    Start time of a single attempt of an API call, restarted once the attempt is allowed
+    through the throttle
+    """
+
+    def __init__(self):
+        self.start_time = flux.current_timeline.time()
+
+    def restart(self):
+        self.start_time = flux.current_timeline.time()
+
+
+class _RequestState:
+    def __init__(self, had_cookies, login_generation):
+        self.had_cookies = had_cookies
+        self.login_generation = login_generation
+        self.did_login = False
+        self.did_interactive_confirmation = False
+
+
 class _AutoRetryContext:
-    def __init__(self, global_retries_dict):
+    def __init__(self, global_retries_dict, retry_budget=None):
         self._retries_dict = None
         self._global_retries_dict = global_retries_dict
+        self._retry_budget = retry_budget
+        self._previous_sleep_seconds = {}
 
     def _should_retry_request(self, exc):
         if self._retries_dict is None:
@@ -802,15 +1333,27 @@ class _AutoRetryContext:
             if retry_predicate not in self._global_retries_dict:
                 return None
             if retry_predicate(exc):
-                max_retries, retry_sleep_seconds = self._global_retries_dict[
-                    retry_predicate
-                ]
+                max_retries, backoff = self._global_retries_dict[retry_predicate]
+                if (
+                    self._retry_budget is not None
+                    and not self._retry_budget.try_spend()
+                ):
+                    _logger.debug("Retry budget exhausted, not retrying: {}", exc)
+                    return None
                 retried_count = max_retries - retries_left + 1
+                retry_sleep_seconds = backoff.get_sleep_seconds(
+                    retried_count, self._previous_sleep_seconds.get(retry_predicate)
+                )
+                self._previous_sleep_seconds[retry_predicate] = retry_sleep_seconds
+                retry_after_seconds = get_retry_after_seconds(exc)
+                if retry_after_seconds is not None:
+                    retry_sleep_seconds = max(retry_sleep_seconds, retry_after_seconds)
                 _logger.debug(
-                    "Auto retry API ({} of {}) by {}: {}",
+                    "Auto retry API ({} of {}) by {} in {:.1f}s: {}",
                     retried_count,
                     max_retries,
                     retry_predicate,
+                    retry_sleep_seconds,
                     exc,
                 )
                 self._retries_dict[retry_predicate] -= 1
@@ -826,3 +1369,15 @@ class _AutoRetryContext:
             flux.current_timeline.sleep(sleep_seconds)
             return True
         return None
+
+    async def __aenter__(self):
+        pass
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        import asyncio
+
+        sleep_seconds = self._should_retry_request(exc_value)
+        if sleep_seconds is not None:
+            await asyncio.sleep(sleep_seconds)
+            return True
+        return None
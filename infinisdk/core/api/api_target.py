@@ -1,9 +1,14 @@
 import abc
+import threading
+import weakref
 
 from munch import Munch
 
+from ..config import config
 from ..type_binder_container import TypeBinderContainer
+from ..utils.python import lazy_attribute
 from .api import API
+from .async_api import AsyncAPI
 
 
 class APITarget(metaclass=abc.ABCMeta):
@@ -30,11 +35,16 @@ class APITarget(metaclass=abc.ABCMeta):
 
         self.api = API(self, auth, use_ssl=use_ssl, ssl_cert=ssl_cert)
         self.api.set_request_default_timeout(self._get_api_timeout())
+        self.async_api = AsyncAPI(self.api)
 
         self.types = Munch()
 
         self._initialize()
         self._caching_enabled = True
+        self._identity_map = None
+        self._identity_map_lock = threading.Lock()
+        if config.root.identity_map.enabled:
+            self.enable_identity_map()
 
     def _initialize(self):
         for object_type in self.OBJECT_TYPES:
@@ -43,10 +53,13 @@ class APITarget(metaclass=abc.ABCMeta):
                 object_type.__name__
             ] = object_type
 
-        # pylint: disable=not-callable
-        self.components = self.SYSTEM_COMPONENTS_TYPE(self)
-        # pylint: disable=not-callable
-        self.events = self.SYSTEM_EVENTS_TYPE(self)
+    @lazy_attribute
+    def components(self):
+        return self.SYSTEM_COMPONENTS_TYPE(self)  # pylint: disable=not-callable
+
+    @lazy_attribute
+    def events(self):
+        return self.SYSTEM_EVENTS_TYPE(self)  # pylint: disable=not-callable
 
     def _get_api_auth(self):
         return None
@@ -66,6 +79,39 @@ class APITarget(metaclass=abc.ABCMeta):
         """Returns whether caching is currently enabled"""
         return self._caching_enabled
 
+    def enable_identity_map(self):
+        """Makes objects constructed for this system unique: constructing an object which is already held elsewhere
+        (e.g. by another query, or through ``get_by_id_lazy``) returns the existing instance, with the new data merged
+        into its cache. Objects are held weakly, and are dropped once no longer referenced
+        """
+        with self._identity_map_lock:
+            if self._identity_map is None:
+                self._identity_map = weakref.WeakValueDictionary()
+
+    def disable_identity_map(self):
+        """Stops deduplicating constructed objects, and forgets the objects held so far"""
+        with self._identity_map_lock:
+            self._identity_map = None
+
+    def is_identity_map_enabled(self):
+        """Returns whether constructed objects are currently deduplicated"""
+        return self._identity_map is not None
+
+    def get_canonical_object(self, obj):
+        """
+        .. warning:: for internal use only. Returns the instance held by the identity map for the given object (storing
+           it if there is none), or the object itself if the identity map is disabled
+        """
+        identity_map = self._identity_map
+        if identity_map is None:
+            return obj
+        key = obj.get_identity_map_key()
+        with self._identity_map_lock:
+            returned = identity_map.get(key)
+            if returned is None:
+                returned = identity_map[key] = obj
+        return returned
+
     def check_version(self):
         """Called automatically by the API on the first request made to the system. Should fetch and verify the
         system version to make sure it can be operated against.
@@ -0,0 +1,147 @@
+# pylint: disable=protected-access
+from functools import partial
+from http import client as httplib
+
+import flux
+import gossip
+from vintage import warn_deprecation
+
+from .api import _RETRY_REQUESTS_EXCEPTION_TYPES, _AttemptTiming, _RequestState
+
+
+def _get_request_delegate(http_method):
+    async def returned(self, path, **kwargs):
+        return await self.request(http_method, path=path, **kwargs)
+
+    returned.__name__ = http_method
+    returned.__doc__ = "Shortcut for :func:`.request({!r}) <AsyncAPI.request>`".format(
+        http_method
+    )
+    return returned
+
+
+class AsyncAPI:
+    """
+    Asyncio interface to the system's API, available as ``system.async_api``.
+
+    Requests share the state of the system's :class:`.API` (session, credentials,
+    contexts and auto-retries) and keep the semantics of :meth:`.API.request`. Blocking
+    socket operations are delegated to an executor, so awaiting never blocks the loop
+    """
+
+    def __init__(self, api, executor=None):
+        super(AsyncAPI, self).__init__()
+        self._api = api
+        self._executor = executor
+
+    @property
+    def api(self):
+        return self._api
+
+    @property
+    def system(self):
+        return self._api.system
+
+    get = _get_request_delegate("get")
+    put = _get_request_delegate("put")
+    post = _get_request_delegate("post")
+    patch = _get_request_delegate("patch")
+    delete = _get_request_delegate("delete")
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def _request(self, http_method, path, **kwargs):
+        api = self._api
+        await self._run_blocking(
+            api._prepare_for_request, path, kwargs.pop("check_version", True)
+        )
+        api_call = api._get_api_call(http_method, path, kwargs)
+
+        returned = failure = None
+        for url in api._get_possible_urls(
+            api_call.specified_address, api_call.http_method
+        ):
+            api_request, prepared = api._prepare_api_request(api_call, url)
+            gossip.trigger("infinidat.sdk.before_api_request", request=prepared)
+            attempt_timing = _AttemptTiming()
+            try:
+                response = await self._run_blocking(
+                    api._send, prepared, api_call.send_kwargs, attempt_timing
+                )
+            except _RETRY_REQUESTS_EXCEPTION_TYPES as e:  # pylint: disable=catching-non-exception
+                failure = api._get_transport_failure(
+                    api_call, url, api_request, attempt_timing.start_time, e
+                )
+                if api._should_try_next_url(api_call, e):
+                    failure.__cause__ = e
+                    continue
+                raise failure from e
+
+            end_time = flux.current_timeline.time()
+            gossip.trigger(
+                "infinidat.sdk.after_api_request", request=prepared, response=response
+            )
+            returned = api._get_response(
+                api_call, url, response, attempt_timing.start_time, end_time
+            )
+            if returned.status_code != httplib.SERVICE_UNAVAILABLE:
+                break
+        if returned is None:
+            raise failure
+        return returned
+
+    async def request(self, http_method, path, assert_success=True, **kwargs):
+        """Sends HTTP API request to the remote system, see :meth:`.API.request`"""
+        api = self._api
+        api._assert_method_enabled(http_method, path)
+        send = partial(
+            self._request_with_retries, http_method, path, assert_success, kwargs
+        )
+        response_cache = api.get_response_cache()
+        if response_cache is None:
+            return await send()
+        return await response_cache.request_async(
+            api.get_auth(), http_method, path, kwargs, send
+        )
+
+    async def _request_with_retries(self, http_method, path, assert_success, kwargs):
+        api = self._api
+        await self._run_blocking(api._restore_saved_session_before_request, path)
+        state = _RequestState(
+            had_cookies=bool(api._session.cookies),
+            login_generation=api._login_generation,
+        )
+        auto_retries_context = api._get_auto_retries_context()
+        while True:
+            async with auto_retries_context:
+                returned = await self._request(http_method, path, **kwargs)
+
+                if api._should_refresh_login(returned, path, state):
+                    await self._run_blocking(api._refresh_login, state)
+                    continue
+
+                if assert_success:
+                    retry_path = api._get_retry_path_on_failure(
+                        http_method, path, returned, state
+                    )
+                    if retry_path is not None:
+                        path = retry_path
+                        continue
+                deprecation_header = returned.response.headers.get(
+                    "x-infinidat-deprecated-api"
+                )
+                if deprecation_header:
+                    warn_deprecation(
+                        "Deprecation warning: {}".format(deprecation_header),
+                        frame_correction=2,
+                    )
+                if returned.response.ok:
+                    await self._run_blocking(api._after_successful_request, path)
+                return returned
+        assert False, "Should never get here!"  # pragma: no cover
@@ -0,0 +1,148 @@
+import collections
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import client as httplib
+
+import flux
+
+
+class Backoff:
+    """
+    Decides how long to sleep before each auto-retry of an API request. Sleeps are
+    capped by ``max_seconds``
+    """
+
+    def __init__(self, max_seconds=None):
+        super(Backoff, self).__init__()
+        self.max_seconds = max_seconds
+
+    def get_sleep_seconds(self, attempt, previous_sleep_seconds):
+        """Returns the sleep before retry number ``attempt`` (starting from 1)"""
+        returned = self._get_uncapped_sleep_seconds(attempt, previous_sleep_seconds)
+        if self.max_seconds is not None:
+            returned = min(returned, self.max_seconds)
+        return returned
+
+    def _get_uncapped_sleep_seconds(self, attempt, previous_sleep_seconds):
+        raise NotImplementedError()  # pragma: no cover
+
+
+class FixedBackoff(Backoff):
+    """Sleeps the same amount of time before every retry"""
+
+    def __init__(self, seconds, max_seconds=None):
+        super(FixedBackoff, self).__init__(max_seconds=max_seconds)
+        self.seconds = seconds
+
+    def _get_uncapped_sleep_seconds(self, attempt, previous_sleep_seconds):
+        return self.seconds
+
+    def __repr__(self):
+        return "<FixedBackoff {}s>".format(self.seconds)
+
+
+class ExponentialBackoff(Backoff):
+    """Multiplies the sleep by ``multiplier`` on every retry. With ``jitter``, a random
+    sleep between 0 and the exponential value is chosen ("full jitter"), so that clients
+    failing together do not retry in lockstep
+    """
+
+    def __init__(self, base_seconds=1, multiplier=2, max_seconds=60, jitter=True):
+        super(ExponentialBackoff, self).__init__(max_seconds=max_seconds)
+        self.base_seconds = base_seconds
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def _get_uncapped_sleep_seconds(self, attempt, previous_sleep_seconds):
+        returned = self.base_seconds * self.multiplier ** (attempt - 1)
+        if self.max_seconds is not None:
+            returned = min(returned, self.max_seconds)
+        if self.jitter:
+            returned = random.uniform(0, returned)
+        return returned
+
+    def __repr__(self):
+        return "<ExponentialBackoff {}s*{}^n>".format(
+            self.base_seconds, self.multiplier
+        )
+
+
+class DecorrelatedJitterBackoff(Backoff):
+    """Chooses each sleep randomly between ``base_seconds`` and three times the previous
+    sleep, spreading retries of concurrent clients while still growing exponentially
+    """
+
+    def __init__(self, base_seconds=1, max_seconds=60):
+        super(DecorrelatedJitterBackoff, self).__init__(max_seconds=max_seconds)
+        self.base_seconds = base_seconds
+
+    def _get_uncapped_sleep_seconds(self, attempt, previous_sleep_seconds):
+        if previous_sleep_seconds is None:
+            previous_sleep_seconds = self.base_seconds
+        return random.uniform(
+            self.base_seconds, max(self.base_seconds, previous_sleep_seconds * 3)
+        )
+
+    def __repr__(self):
+        return "<DecorrelatedJitterBackoff {}s>".format(self.base_seconds)
+
+
+class RetryBudget:
+    """
+    Limits the auto-retries of all requests sent to a system to ``max_retries`` within
+    any period of ``period_seconds``. Once the budget is spent, failures are raised
+    instead of being retried, so that a struggling system is not flooded with retries
+    """
+
+    def __init__(self, max_retries, period_seconds=60):
+        super(RetryBudget, self).__init__()
+        assert max_retries >= 0
+        self.max_retries = max_retries
+        self.period_seconds = period_seconds
+        self._lock = threading.Lock()
+        self._retry_times = collections.deque()
+
+    def try_spend(self):
+        """Consumes a single retry from the budget, returning False if it was spent"""
+        now = flux.current_timeline.time()
+        with self._lock:
+            while (
+                self._retry_times and self._retry_times[0] <= now - self.period_seconds
+            ):
+                self._retry_times.popleft()
+            if len(self._retry_times) >= self.max_retries:
+                return False
+            self._retry_times.append(now)
+            return True
+
+    def get_remaining(self):
+        now = flux.current_timeline.time()
+        with self._lock:
+            return self.max_retries - sum(
+                1 for t in self._retry_times if t > now - self.period_seconds
+            )
+
+
+def get_retry_after_seconds(exc):
+    """Returns the delay requested by a ``Retry-After`` header of a 503 response which
+    failed an API command, or None
+    """
+    response = getattr(exc, "response", None)
+    if response is None or response.status_code != httplib.SERVICE_UNAVAILABLE:
+        return None
+    value = response.response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_time = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_time.tzinfo is None:
+        retry_time = retry_time.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_time - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,71 @@
+from logbook import Logger
+
+from .executor import APIExecutor
+
+_logger = Logger(__name__)
+
+_DEFAULT_MAX_PARALLEL = 16
+
+
+def _get_request_delegate(http_method):
+    def returned(self, path, **kwargs):
+        return self.request(http_method, path=path, **kwargs)
+
+    returned.__name__ = http_method
+    returned.__doc__ = "Shortcut for :func:`.request({!r}) <APIBatch.request>`".format(
+        http_method
+    )
+    return returned
+
+
+class APIBatch:
+    """
+    Sends API requests concurrently, with at most ``max_parallel`` requests in flight.
+    Each request keeps the semantics of :meth:`.API.request` (approval, auto-retries,
+    login refresh and hooks), and is returned as a :class:`concurrent.futures.Future`:
+
+    >>> with system.api.batch(max_parallel=16) as batch:
+    ...     futures = [batch.put(volume.get_this_url_path(), data={'size': 2 * GiB})
+    ...                for volume in volumes]
+
+    Leaving the context waits for all requests to complete, and raises the first failure
+    """
+
+    def __init__(self, api, max_parallel=_DEFAULT_MAX_PARALLEL):
+        super(APIBatch, self).__init__()
+        assert max_parallel > 0, "max_parallel must be positive"
+        self._api = api
+        self._max_parallel = max_parallel
+        self._executor = None
+        self._futures = []
+
+    def __enter__(self):
+        assert self._executor is None, "Batch already started"
+        self._executor = APIExecutor(self._api, max_workers=self._max_parallel)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            for future in self._futures:
+                future.cancel()
+        self._executor.shutdown(wait=True)
+        if exc_type is None:
+            self.get_results()
+
+    get = _get_request_delegate("get")
+    put = _get_request_delegate("put")
+    post = _get_request_delegate("post")
+    patch = _get_request_delegate("patch")
+    delete = _get_request_delegate("delete")
+
+    def request(self, http_method, path, **kwargs):
+        """Schedules an API request, returning a future for its :class:`.Response`"""
+        assert self._executor is not None, "Requests must be sent inside the context"
+        future = self._executor.submit(self._api.request, http_method, path, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def get_results(self):
+        """Waits for all scheduled requests, returning their responses in order"""
+        _logger.debug("Waiting for {} batched API requests", len(self._futures))
+        return [future.result() for future in self._futures]
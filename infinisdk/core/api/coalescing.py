@@ -0,0 +1,64 @@
+import copy
+import threading
+
+from logbook import Logger
+
+_logger = Logger(__name__)
+
+
+class _InFlightRequest:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.exception = None
+
+
+class RequestCoalescer:
+    """
+    Shares a single in-flight request among identical concurrent requests. The first
+    caller sends the request, and callers arriving while it is in flight wait for it
+    and receive copies of its response (or its exception)
+    """
+
+    def __init__(self):
+        super(RequestCoalescer, self).__init__()
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def send(self, key, send_func):
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            is_leader = in_flight is None
+            if is_leader:
+                in_flight = self._in_flight[key] = _InFlightRequest()
+        if is_leader:
+            try:
+                in_flight.response = send_func()
+            except BaseException as e:
+                in_flight.exception = e
+                raise
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+                in_flight.done.set()
+            return in_flight.response
+
+        _logger.trace("Waiting for identical in-flight request: {}", key[0])
+        in_flight.done.wait()
+        if in_flight.exception is not None:
+            raise in_flight.exception
+        return _copy_response(in_flight.response)
+
+
+def get_coalescing_key(prepared):
+    """Requests are identical if they have the same URL and headers (including the
+    authorization and cookie headers)
+    """
+    return (prepared.url, tuple(sorted(prepared.headers.items())))
+
+
+def _copy_response(response):
+    returned = copy.copy(response)
+    returned.headers = response.headers.copy()
+    returned.cookies = response.cookies.copy()
+    return returned
@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+
+class APIExecutor(ThreadPoolExecutor):
+    """
+    A thread pool for sending API requests on behalf of the calling thread. Each task runs
+    with the header overlays (see :meth:`.API.added_headers_context`) which were active in
+    the thread submitting it, since in thread-safe mode overlays only apply to the thread
+    which added them
+    """
+
+    def __init__(self, api, max_workers):
+        super(APIExecutor, self).__init__(max_workers=max_workers)
+        self._api = api
+
+    def submit(self, fn, *args, **kwargs):  # pylint: disable=arguments-differ
+        # pylint: disable=protected-access
+        headers_overlays = list(self._api._get_headers_overlays())
+        return super(APIExecutor, self).submit(
+            self._run, headers_overlays, fn, args, kwargs
+        )
+
+    def _run(self, headers_overlays, fn, args, kwargs):
+        with ExitStack() as stack:
+            for headers in headers_overlays:
+                stack.enter_context(self._api.added_headers_context(headers))
+            return fn(*args, **kwargs)
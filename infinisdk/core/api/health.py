@@ -0,0 +1,181 @@
+import threading
+
+import flux
+from logbook import Logger
+
+_logger = Logger(__name__)
+
+
+class AddressHealth:
+    """Health of a single management address: an exponentially weighted moving average
+    of its latency, and a circuit breaker opened after consecutive failures
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, url):
+        super(AddressHealth, self).__init__()
+        self.url = url
+        self.latency_ewma = None
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def get_state(self, now, reset_seconds):
+        if self.opened_at is None:
+            return self.CLOSED
+        if now - self.opened_at >= reset_seconds:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def __repr__(self):
+        return "<{} latency={} failures={}>".format(
+            self.url, self.latency_ewma, self.consecutive_failures
+        )
+
+
+class AddressHealthTracker:
+    """
+    Tracks the health of the management addresses of a system, and orders them for
+    sending requests:
+
+    * Healthy addresses come first, preferring the last address used unless its
+      latency is ``slow_factor`` times worse than another healthy address
+    * After ``failure_threshold`` consecutive failures an address is skipped for
+      ``reset_seconds``, after which a single retriable request probes it again
+      ("half-open")
+    * If all addresses are failing, all are tried anyway
+    """
+
+    def __init__(
+        self,
+        urls,
+        failure_threshold=2,
+        reset_seconds=30,
+        latency_ewma_alpha=0.3,
+        slow_factor=3.0,
+    ):
+        super(AddressHealthTracker, self).__init__()
+        self._lock = threading.Lock()
+        self._healths = {url: AddressHealth(url) for url in urls}
+        self._urls = list(urls)
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.latency_ewma_alpha = latency_ewma_alpha
+        self.slow_factor = slow_factor
+
+    def get_health(self, url):
+        return self._healths.get(url)
+
+    def get_ordered_urls(self, preferred_url=None, probe=True):
+        """
+        Returns the addresses to try for a request, in order. Only requests which may be
+        retried on another address (``probe=True``) are used to probe half-open addresses;
+        other requests try half-open addresses after the healthy ones
+        """
+        now = flux.current_timeline.time()
+        closed, probed, half_open, opened = [], [], [], []
+        with self._lock:
+            for url in self._urls:
+                health = self._healths[url]
+                state = health.get_state(now, self.reset_seconds)
+                if state == AddressHealth.CLOSED:
+                    closed.append(health)
+                elif state == AddressHealth.HALF_OPEN and not probe:
+                    half_open.append(health)
+                elif state == AddressHealth.HALF_OPEN and self._try_start_probe(
+                    health, now
+                ):
+                    probed.append(health)
+                else:
+                    opened.append(health)
+        closed.sort(key=self._get_closed_sort_key(closed, preferred_url))
+        opened.sort(key=lambda health: health.opened_at)
+        returned = [health.url for health in probed + closed + half_open]
+        if not returned:
+            returned = [health.url for health in opened]
+        return returned
+
+    def get_healths(self, preferred_url=None):
+        """
+        Returns the health of every address: healthy addresses in the order they would be
+        tried, followed by the skipped ones. Unlike :meth:`get_ordered_urls`, this never
+        starts a probe
+        """
+        with self._lock:
+            healths = [self._healths[url] for url in self._urls]
+        closed = [health for health in healths if health.opened_at is None]
+        opened = [health for health in healths if health.opened_at is not None]
+        closed.sort(key=self._get_closed_sort_key(closed, preferred_url))
+        opened.sort(key=lambda health: health.opened_at)
+        return closed + opened
+
+    def _try_start_probe(self, health, now):
+        if (
+            health.probe_started_at is not None
+            and now - health.probe_started_at < self.reset_seconds
+        ):
+            return False  # another request is already probing this address
+        health.probe_started_at = now
+        return True
+
+    def _get_closed_sort_key(self, healths, preferred_url):
+        known_latencies = [
+            h.latency_ewma for h in healths if h.latency_ewma is not None
+        ]
+        best_latency = min(known_latencies) if known_latencies else None
+
+        def returned(health):
+            is_preferred = health.url == preferred_url and (
+                best_latency is None
+                or health.latency_ewma is None
+                or health.latency_ewma <= best_latency * self.slow_factor
+            )
+            latency = health.latency_ewma
+            return (
+                not is_preferred,
+                health.consecutive_failures,
+                latency is None,
+                latency or 0,
+            )
+
+        return returned
+
+    def record_success(self, url, latency):
+        with self._lock:
+            health = self._healths.get(url)
+            if health is None:
+                return
+            if health.opened_at is not None:
+                _logger.debug("API address {} is healthy again", url)
+            if health.latency_ewma is None:
+                health.latency_ewma = latency
+            else:
+                health.latency_ewma += self.latency_ewma_alpha * (
+                    latency - health.latency_ewma
+                )
+            health.consecutive_failures = 0
+            health.opened_at = health.probe_started_at = None
+
+    def record_failure(self, url):
+        now = flux.current_timeline.time()
+        with self._lock:
+            health = self._healths.get(url)
+            if health is None:
+                return
+            health.consecutive_failures += 1
+            health.probe_started_at = None
+            if (
+                health.opened_at is not None
+                or health.consecutive_failures >= self.failure_threshold
+            ):
+                if health.opened_at is None:
+                    _logger.debug(
+                        "Skipping API address {} for {}s after {} failures",
+                        url,
+                        self.reset_seconds,
+                        health.consecutive_failures,
+                    )
+                health.opened_at = now
@@ -0,0 +1,113 @@
+import json
+
+from ..exceptions import InfiniSDKRuntimeException
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JSONCodec:
+    """
+    Encodes request bodies and decodes response bodies using the standard library
+    """
+
+    name = "stdlib"
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    def loads(self, data):
+        """Decodes a JSON document, given as either text or raw bytes"""
+        return json.loads(data)
+
+
+# Maps digits to b"0" and other bytes to b" ", so that runs of digits can be found by a
+# plain substring search (much faster than a regular expression)
+_DIGITS_TRANSLATION = bytes(
+    ord("0") if ord("0") <= byte <= ord("9") else ord(" ") for byte in range(256)
+)
+# Integers which may not fit in 64 bits have at least 19 digits
+_LONG_DIGIT_RUN = b"0" * 19
+
+
+def _has_long_digit_run(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return _LONG_DIGIT_RUN in bytes(data).translate(_DIGITS_TRANSLATION)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Encodes and decodes using orjson, falling back to the standard library for
+    documents with integers wider than 64 bits (which orjson decodes as floats)
+    """
+
+    name = "orjson"
+
+    @classmethod
+    def is_available(cls):
+        return orjson is not None
+
+    def dumps(self, obj):
+        try:
+            # orjson emits UTF-8 bytes, which requests sends as-is
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # e.g. integers wider than 64 bits
+            return super(OrjsonCodec, self).dumps(obj)
+
+    def loads(self, data):
+        if _has_long_digit_run(data):
+            return super(OrjsonCodec, self).loads(data)
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    name = "ujson"
+
+    @classmethod
+    def is_available(cls):
+        return ujson is not None
+
+    def dumps(self, obj):
+        try:
+            return ujson.dumps(obj)
+        except (TypeError, OverflowError):
+            return super(UjsonCodec, self).dumps(obj)
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+_CODECS_BY_PREFERENCE = [OrjsonCodec, UjsonCodec, JSONCodec]
+
+
+def get_json_codec(name):
+    """
+    Returns a codec by its name (``stdlib``, ``orjson`` or ``ujson``). ``auto`` returns
+    the fastest codec installed
+    """
+    if name == "auto":
+        return next(
+            codec_type()
+            for codec_type in _CODECS_BY_PREFERENCE
+            if codec_type.is_available()
+        )
+    for codec_type in _CODECS_BY_PREFERENCE:
+        if codec_type.name == name:
+            if not codec_type.is_available():
+                raise InfiniSDKRuntimeException(
+                    "JSON codec {!r} is not installed".format(name)
+                )
+            return codec_type()
+    raise InfiniSDKRuntimeException("Unknown JSON codec: {!r}".format(name))
@@ -0,0 +1,232 @@
+import bisect
+import re
+import threading
+
+from urlobject import URLObject as URL
+
+#: Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    float("inf"),
+)
+
+_ID_SEGMENT_REGEX = re.compile(r"^-?\d+$")
+
+_PROMETHEUS_COUNTERS = (
+    ("requests_total", "count", "API requests sent"),
+    ("errors_total", "errors", "API requests which failed"),
+    ("sent_bytes_total", "bytes_sent", "Bytes sent in API request bodies"),
+    ("received_bytes_total", "bytes_received", "Bytes received in API responses"),
+    ("queue_seconds_total", "queue_seconds", "Time spent waiting for throttling"),
+)
+
+
+def get_path_template(path):
+    """Returns the path of a URL with its numeric segments (object ids) replaced:
+
+    >>> get_path_template('/api/rest/volumes/1034/snapshots?page=2')
+    '/api/rest/volumes/{id}/snapshots'
+    """
+    path = URL(path).path
+    return "/".join(
+        "{id}" if _ID_SEGMENT_REGEX.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+class EndpointMetrics:
+    """Counters and latency histogram of a single method and path template"""
+
+    def __init__(self):
+        super(EndpointMetrics, self).__init__()
+        self.count = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total_seconds = 0.0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+
+    def record(self, elapsed, is_error, bytes_sent, bytes_received):
+        self.count += 1
+        self.errors += int(is_error)
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        self.total_seconds += elapsed
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def record_queue_delay(self, seconds):
+        self.queue_seconds += seconds
+        self.max_queue_seconds = max(self.max_queue_seconds, seconds)
+
+    def get_percentile(self, percentile):
+        """Estimates a latency percentile, as the upper bound of its bucket"""
+        if not self.count:
+            return None
+        rank = self.count * percentile / 100.0
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]  # pragma: no cover
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "total_seconds": self.total_seconds,
+            "queue_seconds": self.queue_seconds,
+            "max_queue_seconds": self.max_queue_seconds,
+            "p50": self.get_percentile(50),
+            "p95": self.get_percentile(95),
+            "p99": self.get_percentile(99),
+            "buckets": dict(zip(LATENCY_BUCKETS, self.bucket_counts)),
+        }
+
+
+class APIMetrics:
+    """
+    Aggregates the API requests sent to a system per HTTP method and path template (the
+    path with object ids replaced by ``{id}``). Available as ``system.api.metrics``:
+
+    >>> stats = system.api.metrics.snapshot()
+    >>> stats['GET', '/api/rest/volumes/{id}']['p95']  # doctest: +SKIP
+    0.05
+    """
+
+    def __init__(self, enabled=True):
+        super(APIMetrics, self).__init__()
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def enable(self):
+        self._enabled = True
+
+    def disable(self):
+        self._enabled = False
+
+    def is_enabled(self):
+        return self._enabled
+
+    def record(
+        self,
+        http_method,
+        path,
+        elapsed,
+        status_code=None,
+        bytes_sent=0,
+        bytes_received=0,
+    ):
+        """Records a request. A ``status_code`` of None denotes a transport failure"""
+        if not self._enabled:
+            return
+        is_error = status_code is None or status_code >= 400
+        with self._lock:
+            self._get_endpoint(http_method, path).record(
+                elapsed, is_error, bytes_sent, bytes_received
+            )
+
+    def record_queue_delay(self, http_method, path, seconds):
+        """Records the time a request waited for client-side throttling"""
+        if not self._enabled:
+            return
+        with self._lock:
+            self._get_endpoint(http_method, path).record_queue_delay(seconds)
+
+    def _get_endpoint(self, http_method, path):
+        key = (http_method.upper(), get_path_template(path))
+        returned = self._endpoints.get(key)
+        if returned is None:
+            returned = self._endpoints[key] = EndpointMetrics()
+        return returned
+
+    def snapshot(self):
+        """Returns the collected metrics, as a dict keyed by (method, path template)"""
+        with self._lock:
+            return {
+                key: endpoint.to_dict() for key, endpoint in self._endpoints.items()
+            }
+
+    def reset(self):
+        """Discards all collected metrics"""
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_prometheus_text(self, prefix="infinisdk_api", labels=None):
+        """Returns the collected metrics in the Prometheus text exposition format
+
+        :param labels: a dict of additional labels to attach to every sample
+        """
+        extra_labels = "".join(
+            ',{}="{}"'.format(name, _escape_label_value(value))
+            for name, value in sorted((labels or {}).items())
+        )
+        endpoints = [
+            (
+                'method="{}",path="{}"{}'.format(
+                    http_method, _escape_label_value(path), extra_labels
+                ),
+                values,
+            )
+            for (http_method, path), values in sorted(self.snapshot().items())
+        ]
+        lines = []
+        for name, key, help_text in _PROMETHEUS_COUNTERS:
+            lines.append("# HELP {}_{} {}".format(prefix, name, help_text))
+            lines.append("# TYPE {}_{} counter".format(prefix, name))
+            for endpoint_labels, values in endpoints:
+                lines.append(
+                    "{}_{}{{{}}} {}".format(prefix, name, endpoint_labels, values[key])
+                )
+        name = "{}_request_duration_seconds".format(prefix)
+        lines.append("# HELP {} API request latency".format(name))
+        lines.append("# TYPE {} histogram".format(name))
+        for endpoint_labels, values in endpoints:
+            cumulative = 0
+            for bound in LATENCY_BUCKETS:
+                cumulative += values["buckets"][bound]
+                lines.append(
+                    '{}_bucket{{{},le="{}"}} {}'.format(
+                        name,
+                        endpoint_labels,
+                        "+Inf" if bound == float("inf") else bound,
+                        cumulative,
+                    )
+                )
+            lines.append(
+                "{}_sum{{{}}} {}".format(name, endpoint_labels, values["total_seconds"])
+            )
+            lines.append(
+                "{}_count{{{}}} {}".format(name, endpoint_labels, values["count"])
+            )
+        return "\n".join(lines) + "\n"
+
+
+def get_body_length(body):
+    """Returns the size of a request body, or 0 when it is not sent from memory"""
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, bytes):
+        return len(body)
+    return 0
+
+
+def _escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,148 @@
+import collections
+import copy
+import threading
+
+import flux
+from sentinels import NOTHING
+from urlobject import URLObject as URL
+
+_CACHEABLE_REQUEST_KWARGS = frozenset(["params", "timeout", "check_version"])
+_API_PATH_PREFIX = ("api", "rest")
+
+
+def _get_path_segments(path):
+    returned = tuple(segment for segment in URL(path).path.split("/") if segment)
+    if returned[: len(_API_PATH_PREFIX)] == _API_PATH_PREFIX:
+        returned = returned[len(_API_PATH_PREFIX) :]
+    return returned
+
+
+def _are_overlapping(segments, other_segments):
+    length = min(len(segments), len(other_segments))
+    return segments[:length] == other_segments[:length]
+
+
+class ResponseCache:
+    """
+    A size-bounded LRU cache of successful ``GET`` responses, each fresh for
+    ``ttl_seconds``. Entries are keyed by user, path and query, and are invalidated by
+    any other request to an overlapping path (e.g. a ``PUT`` to ``volumes/1``
+    invalidates both ``volumes/1`` and ``volumes?page=2``)
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=5):
+        super(ResponseCache, self).__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._generation = 0
+
+    def get_key(self, auth, http_method, path, kwargs):
+        """Returns the cache key of a request, or None if it cannot be cached"""
+        if http_method.lower() != "get":
+            return None
+        if not _CACHEABLE_REQUEST_KWARGS.issuperset(kwargs):
+            return None
+        path = URL(path)
+        query = sorted(path.query.multi_dict.items())
+        params = kwargs.get("params")
+        return (
+            auth[0] if auth else None,
+            _get_path_segments(path),
+            repr(query),
+            repr(sorted(params.items())) if params else None,
+        )
+
+    def request(self, auth, http_method, path, kwargs, send_func):
+        """Answers a request from the cache if possible, and otherwise sends it by
+        calling ``send_func``
+        """
+        key = self.get_key(auth, http_method, path, kwargs)
+        if key is None:
+            if http_method.lower() == "get":
+                return send_func()
+            self.invalidate_path(path)
+            try:
+                return send_func()
+            finally:
+                self.invalidate_path(path)
+        returned = self.get(key)
+        if returned is None:
+            generation = self._generation
+            returned = send_func()
+            self.put(key, returned, generation)
+        return returned
+
+    async def request_async(self, auth, http_method, path, kwargs, send_coroutine):
+        """Same as :meth:`request`, for coroutine functions"""
+        key = self.get_key(auth, http_method, path, kwargs)
+        if key is None:
+            if http_method.lower() == "get":
+                return await send_coroutine()
+            self.invalidate_path(path)
+            try:
+                return await send_coroutine()
+            finally:
+                self.invalidate_path(path)
+        returned = self.get(key)
+        if returned is None:
+            generation = self._generation
+            returned = await send_coroutine()
+            self.put(key, returned, generation)
+        return returned
+
+    def get(self, key):
+        """Returns a copy of a fresh cached response, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expiry_time, response = entry
+            if expiry_time <= flux.current_timeline.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return _copy_response(response)
+
+    def put(self, key, response, generation):
+        """Caches a response, unless it failed or the cache was invalidated since
+        ``generation`` was current (i.e. while the response was being fetched)
+        """
+        if response.status_code >= 400:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (
+                flux.current_timeline.time() + self.ttl_seconds,
+                _copy_response(response),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_path(self, path):
+        """Discards the responses of all paths overlapping the given path"""
+        segments = _get_path_segments(path)
+        with self._lock:
+            self._generation += 1
+            for key in [
+                key for key in self._entries if _are_overlapping(key[1], segments)
+            ]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _copy_response(response):
+    # Each caller decodes its own copy of the JSON, which it is free to modify
+    returned = copy.copy(response)
+    returned._cached_json = NOTHING  # pylint: disable=protected-access
+    return returned
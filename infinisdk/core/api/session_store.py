@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from logbook import Logger
+from requests.cookies import create_cookie
+
+_logger = Logger(__name__)
+
+
+def _cookie_to_dict(cookie):
+    return {
+        "name": cookie.name,
+        "value": cookie.value,
+        "domain": cookie.domain,
+        "path": cookie.path,
+        "secure": cookie.secure,
+        "expires": cookie.expires,
+        "rest": cookie._rest,  # pylint: disable=protected-access
+    }
+
+
+class SessionStore:
+    """
+    Keeps the session cookies of logged-in users on disk, so that other processes can
+    reuse a still-valid session instead of logging in again. Sessions are stored per
+    credentials and set of system addresses, in files readable only by their owner
+    """
+
+    def __init__(self, directory):
+        super(SessionStore, self).__init__()
+        self.directory = os.path.expanduser(directory)
+
+    def _get_path(self, urls, auth):
+        username, password = auth
+        # Sessions are only shared by processes using the same credentials, so that a
+        # wrong password is not accepted by reusing a session saved with the right one
+        credentials_digest = hashlib.sha256(
+            "{}\n{}".format(username, password).encode("utf-8")
+        ).hexdigest()
+        key = hashlib.sha1(
+            "\n".join(
+                [str(username), credentials_digest] + sorted(str(url) for url in urls)
+            ).encode("utf-8")
+        )
+        return os.path.join(self.directory, "{}.json".format(key.hexdigest()))
+
+    def load(self, urls, auth):
+        """Returns the unexpired cookies saved for the given credentials, or None"""
+        path = self._get_path(urls, auth)
+        try:
+            with open(path) as f:
+                cookie_dicts = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _logger.debug("Ignoring unreadable session file {}: {}", path, e)
+            return None
+        now = time.time()
+        returned = [
+            create_cookie(**cookie_dict)
+            for cookie_dict in cookie_dicts
+            if cookie_dict["expires"] is None or cookie_dict["expires"] > now
+        ]
+        return returned or None
+
+    def save(self, urls, auth, cookies):
+        path = self._get_path(urls, auth)
+        cookie_dicts = [_cookie_to_dict(cookie) for cookie in cookies]
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            # mkstemp creates the file readable and writable only by its owner
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError as e:
+            _logger.debug("Could not save session to {}: {}", path, e)
+            return
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cookie_dicts, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            _logger.debug("Could not save session to {}: {}", path, e)
+            os.remove(temp_path)
+
+    def discard(self, urls, auth):
+        try:
+            os.remove(self._get_path(urls, auth))
+        except FileNotFoundError:
+            pass
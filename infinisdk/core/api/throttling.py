@@ -0,0 +1,106 @@
+import threading
+from contextlib import contextmanager
+
+import flux
+
+
+class TokenBucket:
+    """Allows ``rate`` operations per second on average, in bursts of up to ``burst``"""
+
+    def __init__(self, rate, burst=None):
+        super(TokenBucket, self).__init__()
+        assert rate > 0, "rate must be positive"
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate)
+        self._tokens = self.burst
+        self._last_time = flux.current_timeline.time()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes a token, returning how many seconds the caller should wait for it"""
+        with self._lock:
+            now = flux.current_timeline.time()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last_time) * self.rate
+            )
+            self._last_time = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+
+class Limit:
+    """A request rate and/or a maximum number of requests in flight"""
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None):
+        super(Limit, self).__init__()
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self._bucket = TokenBucket(rate, burst) if rate is not None else None
+        self._semaphore = (
+            threading.BoundedSemaphore(max_in_flight)
+            if max_in_flight is not None
+            else None
+        )
+
+    def wait_for_turn(self):
+        if self._bucket is not None:
+            delay = self._bucket.reserve()
+            if delay:
+                flux.current_timeline.sleep(delay)
+
+    def enter(self):
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+
+    def exit(self):
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def __repr__(self):
+        return "<Limit rate={} max_in_flight={}>".format(self.rate, self.max_in_flight)
+
+
+class RequestThrottle:
+    """
+    Limits the requests sent to a system, both overall and per HTTP method. Requests
+    exceeding the limits are delayed (never rejected) until they are allowed through
+    """
+
+    def __init__(self, limit=None, method_limits=None):
+        super(RequestThrottle, self).__init__()
+        self._limit = limit
+        self._method_limits = {
+            http_method.lower(): method_limit
+            for http_method, method_limit in (method_limits or {}).items()
+        }
+
+    def is_active(self):
+        return self._limit is not None or bool(self._method_limits)
+
+    def _get_limits(self, http_method):
+        returned = []
+        method_limit = self._method_limits.get(http_method.lower())
+        if method_limit is not None:
+            returned.append(method_limit)
+        if self._limit is not None:
+            returned.append(self._limit)
+        return returned
+
+    @contextmanager
+    def acquire(self, http_method):
+        """Waits until a request is allowed, yielding the time it waited (in seconds)"""
+        limits = self._get_limits(http_method)
+        start_time = flux.current_timeline.time()
+        for limit in limits:
+            limit.wait_for_turn()
+        entered = []
+        try:
+            for limit in limits:
+                limit.enter()
+                entered.append(limit)
+            yield flux.current_timeline.time() - start_time
+        finally:
+            for limit in reversed(entered):
+                limit.exit()
@@ -0,0 +1,143 @@
+import collections
+import gzip
+import json
+import threading
+from datetime import timedelta
+
+import requests
+from logbook import Logger
+from urlobject import URLObject as URL
+
+from ..exceptions import UnrecordedRequest
+
+_logger = Logger(__name__)
+
+# Response headers which are session or transfer specific, and are never recorded
+_UNRECORDED_HEADERS = frozenset(
+    [
+        "set-cookie",
+        "date",
+        "connection",
+        "keep-alive",
+        "content-encoding",
+        "content-length",
+        "transfer-encoding",
+    ]
+)
+
+
+def get_request_key(method, url):
+    """Returns the key identifying a request in a recording: its method, path and query
+    parameters (sorted), regardless of the address it was sent to
+    """
+    url = URL(url)
+    return "{} {}?{}".format(
+        method.upper(),
+        url.path,
+        "&".join(
+            "{}={}".format(name, value)
+            for name, values in sorted(url.query.multi_dict.items())
+            for value in values
+        ),
+    )
+
+
+class RequestsTransport:
+    """Sends prepared requests over the network, through the API's session"""
+
+    def send(self, session, prepared, **send_kwargs):
+        return session.send(prepared, **send_kwargs)
+
+    def close(self):
+        pass
+
+
+class RecordingTransport(RequestsTransport):
+    """
+    Sends requests through another transport, while recording each request and its
+    response to a gzipped JSON-lines file, to be replayed later by
+    :class:`ReplayTransport`. Request bodies, request headers and cookies are never
+    recorded
+    """
+
+    def __init__(self, path, transport=None):
+        super(RecordingTransport, self).__init__()
+        self._transport = transport if transport is not None else RequestsTransport()
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._path = path
+
+    def send(self, session, prepared, **send_kwargs):
+        returned = self._transport.send(session, prepared, **send_kwargs)
+        entry = {
+            "key": get_request_key(prepared.method, prepared.url),
+            "status_code": returned.status_code,
+            "reason": returned.reason,
+            "headers": {
+                name: value
+                for name, value in returned.headers.items()
+                if name.lower() not in _UNRECORDED_HEADERS
+            },
+            "content": returned.content.decode("utf-8", errors="surrogateescape"),
+        }
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+        return returned
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                _logger.debug("Closing API recording {}", self._path)
+                self._file.close()
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class ReplayTransport(RequestsTransport):
+    """
+    Answers requests from a file written by :class:`RecordingTransport`, without
+    accessing the network. Requests are matched by method, path and query parameters.
+    When the same request was recorded several times, its responses are replayed in
+    their recorded order, starting over once all were used
+    """
+
+    def __init__(self, path):
+        super(ReplayTransport, self).__init__()
+        self._lock = threading.Lock()
+        self._responses = collections.defaultdict(list)
+        self._next_indexes = collections.Counter()
+        with gzip.open(path, "rt", encoding="utf-8") as recording:
+            for line in recording:
+                entry = json.loads(line)
+                self._responses[entry["key"]].append(entry)
+
+    def send(self, session, prepared, **send_kwargs):
+        key = get_request_key(prepared.method, prepared.url)
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                raise UnrecordedRequest("No recorded response for {}".format(key))
+            entry = entries[self._next_indexes[key] % len(entries)]
+            self._next_indexes[key] += 1
+        returned = requests.Response()
+        returned.status_code = entry["status_code"]
+        returned.reason = entry["reason"]
+        returned.headers.update(entry["headers"])
+        returned._content = entry["content"].encode(  # pylint: disable=protected-access
+            "utf-8", errors="surrogateescape"
+        )
+        returned.encoding = "utf-8"
+        returned.url = prepared.url
+        returned.request = prepared
+        returned.elapsed = timedelta(0)
+        return returned
+
+    def rewind(self):
+        """Replays all requests from their first recorded response again"""
+        with self._lock:
+            self._next_indexes.clear()
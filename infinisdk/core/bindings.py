@@ -98,7 +98,23 @@ class RelatedObjectBinding(InfiniSDKBinding):
     def get_value_from_api_value(self, system, objtype, obj, api_value):
         if api_value == self._value_for_none or api_value is None:
             return None
-        return getattr(system, self._collection_name).get_by_id_lazy(api_value)
+        return self._get_related_object(system, obj, api_value)
+
+    def get_related_binder(self, system):
+        return getattr(system, self._collection_name)
+
+    def get_related_ids(self, api_value):
+        """Returns the ids of the objects referenced by an API value of the field"""
+        if api_value == self._value_for_none or api_value is None:
+            return []
+        return [api_value]
+
+    def _get_related_object(self, system, obj, related_id):
+        if obj is not None:
+            returned = obj.get_prefetched_related_object(self._field.name, related_id)
+            if returned is not None:
+                return returned
+        return self.get_related_binder(system).get_by_id_lazy(related_id)
 
 
 class RelatedObjectNamedBinding(RelatedObjectBinding):
@@ -126,8 +142,10 @@ class ListOfRelatedObjectIDsBinding(RelatedObjectBinding):
         return [single_value.id for single_value in value]
 
     def get_value_from_api_value(self, system, objtype, obj, api_value):
-        obj_getter = getattr(system, self._collection_name).get_by_id_lazy
-        return [obj_getter(obj_id) for obj_id in api_value]
+        return [self._get_related_object(system, obj, obj_id) for obj_id in api_value]
+
+    def get_related_ids(self, api_value):
+        return list(api_value or ())
 
 
 class RelatedComponentBinding(InfiniSDKBinding):
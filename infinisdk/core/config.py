@@ -7,10 +7,45 @@ config = confetti.Config(
     dict(
         check_version_compatibility=True,
         ini_file_path="~/.infinidat/infinisdk.ini",
+        identity_map=dict(
+            enabled=False,
+        ),
         api={
             "log": {
                 "pretty_json": False,
-            }
+            },
+            "thread_safe": False,
+            "json_codec": "stdlib",
+            "collect_metrics": True,
+            "coalesce_get_requests": False,
+            "session_store": {
+                "enabled": False,
+                "directory": "~/.infinidat/sessions",
+            },
+            "response_cache": {
+                "enabled": False,
+                "max_entries": 1024,
+                "ttl_seconds": 5,
+            },
+            "throttling": {
+                "rate_per_second": None,
+                "burst": None,
+                "max_in_flight": None,
+            },
+            "address_health": {
+                "failure_threshold": 2,
+                "reset_seconds": 30,
+                "latency_ewma_alpha": 0.3,
+                "slow_factor": 3.0,
+            },
+            "connection_pool": {
+                "num_pools": 10,
+                "max_connections_per_host": 10,
+                "block_when_full": False,
+                "keepalive_idle_seconds": None,
+                "keepalive_interval_seconds": None,
+                "keepalive_probes": None,
+            },
         },
         defaults=dict(
             system_api_port=80,
@@ -28,6 +63,11 @@ config = confetti.Config(
                     total_count=dict(mock=0, simulator=480),
                 ),
             ),
+            bootstrap_cache=dict(
+                enabled=False,
+                directory="~/.infinidat/bootstrap_cache",
+                ttl_seconds=24 * 60 * 60,
+            ),
             approval_required_codes=tuple(
                 (
                     "APPROVAL_REQUIRED",
@@ -11,7 +11,7 @@ class Events(TypeBinder):
         self._types = None
 
     def get_events(self, min_event_id=0):
-        return self.find(Event.fields.id >= min_event_id).sort(Q.id).to_list()
+        return self.find(Event.fields.id >= min_event_id).keyset().to_list()
 
     def get_last_events(self, num, reversed=False):  # pylint: disable=redefined-builtin
         returned = self.find().sort(-Q.id).page_size(num).page(1).to_list()
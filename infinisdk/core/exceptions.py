@@ -1,4 +1,3 @@
-import arrow
 from munch import munchify
 from urlobject import URLObject as URL
 
@@ -67,6 +66,8 @@ class APITransportFailure(APICommandException):
 
     @property
     def request_timestamp(self):
+        import arrow
+
         return arrow.Arrow.fromtimestamp(self.start_timestamp)
 
     def __repr__(self):
@@ -142,10 +143,14 @@ class APICommandFailed(APICommandException):
 
     @property
     def request_timestamp(self):
+        import arrow
+
         return arrow.Arrow.fromtimestamp(self.response.start_time)
 
     @property
     def response_timestamp(self):
+        import arrow
+
         return arrow.Arrow.fromtimestamp(self.response.end_time)
 
     def __str__(self):
@@ -221,3 +226,9 @@ class MethodDisabled(InfiniSDKException):
     """Thrown when attempting to use an HTTP method, which has been explicitly disabled"""
 
     pass
+
+
+class UnrecordedRequest(InfiniSDKException):
+    """Thrown when replaying API responses for a request which was never recorded"""
+
+    pass
@@ -1,4 +1,5 @@
 import collections
+import operator
 
 _operator_name_to_sign_str = {
     "eq": "=",
@@ -9,6 +10,18 @@ _operator_name_to_sign_str = {
     "ne": "!=",
 }
 
+_comparison_operators = {
+    "gt": operator.gt,
+    "lt": operator.lt,
+    "ge": operator.ge,
+    "le": operator.le,
+}
+
+#: operators which can be evaluated on objects that were already fetched
+LOCAL_OPERATOR_NAMES = frozenset(
+    ["eq", "ne", "in", "notin", "between", "is", "isnot"] + list(_comparison_operators)
+)
+
 
 class FieldFilter:
     def __init__(self, field, operator_name, value):
@@ -59,3 +72,62 @@ class FieldFilter:
         if value is None:
             value = "null"
         return value
+
+    def get_local_api_value(self, system):
+        """
+        Returns the filter's value as an API value, for evaluating the filter on objects which
+        were already fetched. Like when sending the filter, values are translated and converted
+        to the field's API type by its binding (e.g. ``'5'`` to ``5`` for integer fields)
+        """
+        if self.operator_name in ("in", "notin", "between"):
+            return [self._get_single_local_api_value(val, system) for val in self.value]
+        return self._get_single_local_api_value(self.value, system)
+
+    def _get_single_local_api_value(self, value, system):
+        if value is None:
+            return None
+        return self.field.binding.get_api_value_from_value(system, None, None, value)
+
+    def get_local_matcher(self, system):
+        """
+        Returns a function telling whether an object's API value of the field matches the
+        filter. Only operators in ``LOCAL_OPERATOR_NAMES`` are supported
+        """
+        assert (
+            self.operator_name in LOCAL_OPERATOR_NAMES
+        ), "Cannot evaluate {!r} locally".format(self.operator_name)
+        value = self.get_local_api_value(system)
+        if self.operator_name == "eq":
+            return lambda api_value: api_value == value
+        if self.operator_name == "ne":
+            return lambda api_value: api_value != value
+        if self.operator_name in ("in", "notin"):
+            try:
+                values = frozenset(value)
+            except TypeError:
+                values = value
+            if self.operator_name == "in":
+                return lambda api_value: api_value in values
+            return lambda api_value: api_value not in values
+        if self.operator_name == "is":
+            return lambda api_value: (
+                api_value is None if value is None else api_value == value
+            )
+        if self.operator_name == "isnot":
+            return lambda api_value: (
+                api_value is not None if value is None else api_value != value
+            )
+        if self.operator_name == "between":
+            low, high = value
+            return lambda api_value: _safe_compare(
+                operator.ge, api_value, low
+            ) and _safe_compare(operator.le, api_value, high)
+        compare = _comparison_operators[self.operator_name]
+        return lambda api_value: _safe_compare(compare, api_value, value)
+
+
+def _safe_compare(compare, api_value, value):
+    try:
+        return compare(api_value, value)
+    except TypeError:  # e.g. comparing to None
+        return False
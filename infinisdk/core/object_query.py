@@ -1,16 +1,19 @@
+import collections
 import itertools
 import random
 from numbers import Number
 
+from sentinels import NOTHING
 from urlobject import URLObject as URL
 
-from .exceptions import ChangedDuringIteration, ObjectNotFound
+from .exceptions import ChangedDuringIteration, InvalidUsageException, ObjectNotFound
 from .field import Field
 from .field_filter import FieldFilter
 from .q import QField
 
 _DEFAULT_SYSTEM_PAGE_SIZE = 50
 _DEFAULT_PAGE_SIZE = 1000
+_DEFAULT_PREFETCH_WORKERS = 8
 
 
 class QueryBase:
@@ -69,6 +72,13 @@ class LazyQuery(QueryBase):
         self._mutable = True
         self._included_fields = None
         self._extra = None
+        self._prefetch_workers = None
+        self._keyset_field = None
+        self._keyset_last_value = None
+        self._keyset_exhausted = False
+        self._related_fields = None
+        self._related_objects = {}
+        self._missing_related_ids = {}
 
     def get_extra(self):
         self._fetch()
@@ -97,23 +107,243 @@ class LazyQuery(QueryBase):
         fields_str = ",".join(fields)
         return self.extend_url(include=fields_str)
 
+    def prefetch(self, workers=_DEFAULT_PREFETCH_WORKERS):
+        """
+        Fetches the remaining pages of the query concurrently while iterating over it,
+        using up to ``workers`` parallel requests. Objects are still yielded in order
+        """
+        assert self._mutable, "Cannot modify query after fetching"
+        assert workers > 0, "Number of prefetch workers must be positive"
+        self._prefetch_workers = workers
+        return self
+
     def __iter__(self):
+        if self._keyset_field is not None:
+            yield from self._iter_keyset()
+            return
         if self._total_num_objects is None:
             self._fetch()
+        start, end = self._get_iteration_range()
+        prefetched_pages = None
+        if self._prefetch_workers is not None and self._requested_page is None:
+            prefetched_pages = self._iter_prefetched_pages(start, end)
+        try:
+            for i in range(start, end):
+                if prefetched_pages is not None:
+                    while self._fetched.get(i) is None:
+                        if next(prefetched_pages, NOTHING) is NOTHING:
+                            break
+                try:
+                    yield self[i]
+                except IndexError as e:
+                    if i != self._total_num_objects:
+                        raise ChangedDuringIteration(
+                            "Queried path's size changed during iteration"
+                        ) from e
+        finally:
+            if prefetched_pages is not None:
+                prefetched_pages.close()
+
+    async def __aiter__(self):
+        """
+        Iterates over the query's objects, fetching pages through the system's
+        :class:`.AsyncAPI`::
+
+            async for volume in system.volumes.find(pool=pool):
+                ...
+        """
+        await self._afetch()
+        if self._keyset_field is not None:
+            start, end = 0, None
+        else:
+            start, end = self._get_iteration_range()
+        prefetched_pages = collections.deque()
+        if (
+            self._prefetch_workers is not None
+            and self._requested_page is None
+            and self._keyset_field is None
+        ):
+            prefetched_pages = self._start_async_prefetch(start, end)
+        try:
+            for i in itertools.count(start) if end is None else range(start, end):
+                while prefetched_pages and self._fetched.get(i) is None:
+                    self._store_response(await prefetched_pages.popleft())
+                await self._afetch(i)
+                if self._fetched.get(i) is None:
+                    if self._keyset_field is not None:
+                        return
+                    raise ChangedDuringIteration(
+                        "Queried path's size changed during iteration"
+                    )
+                self._translate_item_if_needed(i)
+                yield self._fetched[i]
+        finally:
+            for task in prefetched_pages:
+                task.cancel()
+
+    def _start_async_prefetch(self, start, end):
+        import asyncio
+
+        semaphore = asyncio.Semaphore(self._prefetch_workers)
+
+        async def fetch_page(query):
+            async with semaphore:
+                return await self.system.async_api.get(query)
+
+        return collections.deque(
+            asyncio.ensure_future(fetch_page(query))
+            for query in self._iter_page_queries(start, end)
+        )
+
+    def _get_iteration_range(self):
         if self._requested_page is not None:
             start = (self._requested_page - 1) * self._requested_page_size
             end = min(start + self._requested_page_size, self._total_num_objects)
         else:
             start = 0
             end = len(self)
-        for i in range(start, end):
+        return start, end
+
+    def stream(self):
+        """
+        Iterates over the query's objects page by page, discarding each page once its
+        objects were yielded. Unlike regular iteration, fetched objects are not kept by
+        the query, so memory consumption remains flat regardless of the collection size
+
+        .. note:: The returned iterator can only be consumed once
+        """
+        self._mutable = False
+        if self._keyset_field is not None:
+            responses = self._iter_keyset_responses()
+        else:
+            responses = self._iter_streamed_responses()
+        for response in responses:
+            # Related objects are kept only for the current page, and by its objects
+            related_objects = {}
+            self._prefetch_related_objects(response.get_result(), related_objects)
+            for item in response.get_result():
+                if self.factory is None:
+                    yield item
+                else:
+                    yield self._construct(item, related_objects)
+
+    def _iter_streamed_responses(self):
+        page_size = self._get_page_size()
+        first_page = self._requested_page if self._requested_page is not None else 1
+        response = self.system.api.get(self._get_query_for_page(first_page, page_size))
+        self._total_num_objects = response.get_total_num_objects()
+        if self._included_fields is not None:
+            self._extra = response.get_extra()
+        if self._requested_page is not None:
+            yield response
+            return
+        num_pages = -(-self._total_num_objects // page_size)
+        page_queries = (
+            self._get_query_for_page(page_number, page_size)
+            for page_number in range(2, num_pages + 1)
+        )
+        if self._prefetch_workers is None:
+            responses = itertools.chain(
+                [response], (self.system.api.get(query) for query in page_queries)
+            )
+        else:
+            responses = itertools.chain(
+                [response], self._iter_prefetched_responses(page_queries)
+            )
+        for page_number, response in enumerate(responses, start=1):
+            if page_number < num_pages and len(response.get_result()) < page_size:
+                raise ChangedDuringIteration(
+                    "Queried path's size changed during iteration"
+                )
+            yield response
+
+    def _iter_prefetched_responses(self, page_queries):
+        with self.system.api.get_executor(self._prefetch_workers) as executor:
+            pending = collections.deque(
+                executor.submit(self.system.api.get, query)
+                for query in itertools.islice(page_queries, self._prefetch_workers)
+            )
             try:
-                yield self[i]
-            except IndexError as e:
-                if i != self._total_num_objects:
-                    raise ChangedDuringIteration(
-                        "Queried path's size changed during iteration"
-                    ) from e
+                while pending:
+                    response = pending.popleft().result()
+                    for query in itertools.islice(page_queries, 1):
+                        pending.append(executor.submit(self.system.api.get, query))
+                    yield response
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _iter_keyset_responses(self):
+        page_size = self._get_page_size()
+        last_value = None
+        while True:
+            response = self.system.api.get(self._get_keyset_query(last_value))
+            if self._total_num_objects is None:
+                self._total_num_objects = response.get_total_num_objects()
+            if self._included_fields is not None:
+                self._extra = response.get_extra()
+            result = response.get_result()
+            yield response
+            if len(result) < page_size:
+                return
+            last_value = result[-1][self._keyset_field.api_name]
+
+    def _get_keyset_query(self, last_value):
+        returned = self.query.set_query_param("page_size", str(self._get_page_size()))
+        if last_value is None:
+            return returned
+        api_name = self._keyset_field.api_name
+        # Lower bounds on the keyset field are implied by the continuation filter
+        kept_filters = [
+            value
+            for value in returned.query_multi_dict.get(api_name, [])
+            if value.split(":", 1)[0] not in ("gt", "ge")
+        ]
+        returned = returned.del_query_param(api_name)
+        for value in kept_filters:
+            returned = returned.add_query_param(api_name, value)
+        return returned.add_query_param(api_name, "gt:{}".format(last_value))
+
+    def _iter_keyset(self):
+        index = 0
+        while True:
+            self._fetch(index)
+            if self._fetched.get(index) is None:
+                return
+            yield self[index]
+            index += 1
+
+    def _iter_page_queries(self, start, end):
+        page_size = self._get_page_size()
+        element_index = start
+        while element_index < end:
+            if self._fetched.get(element_index) is None:
+                query = self._get_query_for_index(element_index)
+                yield query
+                if query is self.query:  # unpaged, the system returns its default page
+                    element_index = _DEFAULT_SYSTEM_PAGE_SIZE
+                else:
+                    element_index = (element_index // page_size + 1) * page_size
+            else:
+                element_index += 1
+
+    def _iter_prefetched_pages(self, start, end):
+        page_queries = list(self._iter_page_queries(start, end))
+        if not page_queries:
+            return
+        with self.system.api.get_executor(
+            min(self._prefetch_workers, len(page_queries))
+        ) as executor:
+            futures = [
+                executor.submit(self.system.api.get, query) for query in page_queries
+            ]
+            try:
+                for future in futures:
+                    self._store_response(future.result())
+                    yield
+            finally:
+                for future in futures:
+                    future.cancel()
 
     def __len__(self):
         if self._total_num_objects is None:
@@ -133,9 +363,43 @@ class LazyQuery(QueryBase):
 
         received_item = self._fetched.get(item_index)
         if isinstance(received_item, dict):
-            obj = self._fetched[item_index] = self.factory(self.system, received_item)
+            obj = self._fetched[item_index] = self._construct(received_item)
             self._objects_by_id[obj.id] = obj
 
+    def _construct(self, item, related_objects=None):
+        returned = self.factory(self.system, item)
+        if self._related_fields is not None:
+            if related_objects is None:
+                related_objects = self._related_objects
+            returned.set_prefetched_related_objects(related_objects)
+        return returned
+
+    def _prefetch_related_objects(self, items, related_objects=None):
+        if self._related_fields is None:
+            return
+        if related_objects is None:
+            related_objects = self._related_objects
+        for field in self._related_fields:
+            field_related_objects = related_objects.setdefault(field.name, {})
+            # Referenced objects which do not exist are only looked for once per query
+            missing_ids = self._missing_related_ids.setdefault(field.name, set())
+            related_ids = set(
+                related_id
+                for item in items
+                for related_id in field.binding.get_related_ids(
+                    item.get(field.api_name)
+                )
+                if related_id not in field_related_objects
+                and related_id not in missing_ids
+            )
+            if not related_ids:
+                continue
+            binder = field.binding.get_related_binder(self.system)
+            for related_obj in binder.safe_get_by_ids(related_ids):
+                if related_obj is not None:
+                    field_related_objects[related_obj.id] = related_obj
+            missing_ids.update(related_ids.difference(field_related_objects))
+
     def __getitem__(self, index):
         if isinstance(index, Number) and index < 0:
             raise NotImplementedError("Negative indices not supported yet")
@@ -149,21 +413,63 @@ class LazyQuery(QueryBase):
 
     def _fetch(self, element_index=None):
         self._mutable = False
+        if self._keyset_field is not None:
+            self._fetch_by_keyset(element_index or 0)
+            return
         element_index = self._get_requested_element_index(element_index)
         assert element_index is not None
         if self._fetched.get(element_index) is None:
             query = self._get_query_for_index(element_index)
-            response = self.system.api.get(query)
+            self._store_response(self.system.api.get(query))
 
-            if self._total_num_objects is None:
-                self._total_num_objects = response.get_total_num_objects()
-            if self._included_fields is not None:
-                self._extra = response.get_extra()
-            for index, obj in enumerate(
-                response.get_result(), start=response.get_page_start_index()
+    def _fetch_by_keyset(self, element_index):
+        while self._fetched.get(element_index) is None and not self._keyset_exhausted:
+            query = self._get_keyset_query(self._keyset_last_value)
+            self._store_keyset_response(self.system.api.get(query))
+
+    async def _afetch(self, element_index=None):
+        self._mutable = False
+        element_index = self._get_requested_element_index(element_index)
+        if self._keyset_field is not None:
+            while (
+                self._fetched.get(element_index) is None and not self._keyset_exhausted
             ):
-                if self._fetched.get(index) is None:
-                    self._fetched[index] = obj
+                query = self._get_keyset_query(self._keyset_last_value)
+                self._store_keyset_response(await self.system.async_api.get(query))
+        elif self._fetched.get(element_index) is None:
+            query = self._get_query_for_index(element_index)
+            self._store_response(await self.system.async_api.get(query))
+
+    def _store_keyset_response(self, response):
+        if self._total_num_objects is None:
+            self._total_num_objects = response.get_total_num_objects()
+        if self._included_fields is not None:
+            self._extra = response.get_extra()
+        result = response.get_result()
+        for index, obj in enumerate(result, start=len(self._fetched)):
+            self._fetched[index] = obj
+        if len(result) < self._get_page_size():
+            self._keyset_exhausted = True
+        else:
+            self._keyset_last_value = result[-1][self._keyset_field.api_name]
+        self._prefetch_related_objects(result)
+
+    def _store_response(self, response):
+        if self._total_num_objects is None:
+            self._total_num_objects = response.get_total_num_objects()
+        if self._included_fields is not None:
+            self._extra = response.get_extra()
+        for index, obj in enumerate(
+            response.get_result(), start=response.get_page_start_index()
+        ):
+            if self._fetched.get(index) is None:
+                self._fetched[index] = obj
+        self._prefetch_related_objects(response.get_result())
+
+    def _get_page_size(self):
+        if self._requested_page_size is not None:
+            return self._requested_page_size
+        return _DEFAULT_PAGE_SIZE
 
     def _get_query_for_index(self, element_index):
         returned = self.query
@@ -172,16 +478,14 @@ class LazyQuery(QueryBase):
             and element_index < _DEFAULT_SYSTEM_PAGE_SIZE
         ):
             return returned
-        page_size = (
-            self._requested_page_size
-            if self._requested_page_size is not None
-            else _DEFAULT_PAGE_SIZE
-        )
+        page_size = self._get_page_size()
         page_number = int(element_index // page_size) + 1
-        returned = returned.set_query_param("page", str(page_number)).set_query_param(
+        return self._get_query_for_page(page_number, page_size)
+
+    def _get_query_for_page(self, page_number, page_size):
+        return self.query.set_query_param("page", str(page_number)).set_query_param(
             "page_size", str(page_size)
         )
-        return returned
 
     def _get_requested_element_index(self, element_index):
         if element_index is None:
@@ -203,6 +507,7 @@ class LazyQuery(QueryBase):
         """
         assert page_index != 0, "Page cannot be zero based"
         assert self._mutable, "Cannot modify query after fetching"
+        assert self._keyset_field is None, "Cannot use page() with keyset pagination"
         self._requested_page = page_index
         return self
 
@@ -215,6 +520,40 @@ class LazyQuery(QueryBase):
         return self
 
 
+class CachedQuery(QueryBase):
+    """
+    Result of a query evaluated on objects which were already fetched (e.g. inside
+    :meth:`.MonomorphicBinder.fetch_once_context`). Page sizes and field selection do not
+    apply to it, and are accepted only for compatibility with :class:`LazyQuery`
+    """
+
+    def __init__(self, objects, description):
+        super(CachedQuery, self).__init__()
+        self._objects = objects
+        self._description = description
+
+    def __iter__(self):
+        return iter(self._objects)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __getitem__(self, index):
+        return self._objects[index]
+
+    def page_size(self, page_size):  # pylint: disable=unused-argument
+        return self
+
+    def only_fields(self, field_names):  # pylint: disable=unused-argument
+        return self
+
+    def __str__(self):
+        return self._description
+
+    def __repr__(self):
+        return "<CachedQuery {}>".format(self)
+
+
 class PolymorphicQuery(LazyQuery):
     def __init__(self, system, url, object_types, factory):
         super(PolymorphicQuery, self).__init__(system, url, factory)
@@ -271,6 +610,44 @@ class PolymorphicQuery(LazyQuery):
         self.query = query
         return self
 
+    def prefetch_related(self, *field_names):
+        """
+        Fetches the objects referenced by the given fields (e.g. ``pool``) along with each
+        page of the query, using a few bulk queries per page instead of a query per
+        referenced object. Getting these fields from the query's objects then returns the
+        prefetched objects, with their fields already cached::
+
+            for volume in system.volumes.find().prefetch_related('pool', 'cons_group'):
+                print(volume.get_pool().get_name())
+        """
+        assert self._mutable, "Cannot modify query after fetching"
+        if self._related_fields is None:
+            self._related_fields = []
+        for field_name in field_names:
+            field = self._get_or_fabricate_field(field_name)
+            if not hasattr(field.binding, "get_related_binder"):
+                raise InvalidUsageException(
+                    "Field {!r} does not refer to other objects".format(field_name)
+                )
+            self._related_fields.append(field)
+        return self
+
+    def keyset(self):
+        """
+        Paginates the query by object id instead of by page number: the objects are
+        sorted by id, and each page continues after the last id of the previous one.
+        Pages are never re-read, and objects created or deleted during the iteration do
+        not cause :class:`.ChangedDuringIteration` to be raised
+        """
+        assert self._mutable, "Cannot modify query after fetching"
+        assert self._requested_page is None, "Cannot use keyset pagination with page()"
+        assert (
+            "sort" not in self.query.query_dict
+        ), "Keyset pagination cannot be combined with other sort criteria"
+        uid_field_name = self.object_types[0].UID_FIELD
+        self._keyset_field = self._get_or_fabricate_field(uid_field_name)
+        return self.sort(self._keyset_field)
+
     def only_fields(self, field_names):
         """
         Plucks the specified field names from the query. Can be specified multiple times
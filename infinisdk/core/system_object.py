@@ -37,6 +37,7 @@ class BaseSystemObject(metaclass=FieldsMeta):
     UID_FIELD = "id"
     #: specifies which :class:`.TypeBinder` subclass is to be used for this type
     BINDER_CLASS = MonomorphicBinder
+    _prefetched_related_objects = None
 
     def __init__(self, system, initial_data):
         super(BaseSystemObject, self).__init__()
@@ -120,17 +121,30 @@ class BaseSystemObject(metaclass=FieldsMeta):
     def get_unique_key(self):
         return (self.system, type(self).__name__, self.id)
 
+    def get_identity_map_key(self):
+        """
+        Returns the key of the object in its system's identity map. Unlike :meth:`get_unique_key`, it does not
+        include the system, whose hash changes once its name is known
+        """
+        return (type(self).__name__, self.id)
+
     def __deepcopy__(self, memo):
-        return self.construct(self.system, copy.deepcopy(self._cache, memo))
+        # Not through construct(), which would return this very object when the identity map is enabled
+        return type(self)(self.system, copy.deepcopy(self._cache, memo))
 
     @classmethod
     def construct(cls, system, data):
         """
         Template method to enable customizing the object instantiation process.
 
-        This enables system components to be cached rather than re-fetched every time
+        This enables system components to be cached rather than re-fetched every time. When the system's identity map
+        is enabled, an object which already exists is returned instead, with ``data`` merged into its cache
         """
-        return cls(system, data)
+        returned = cls(system, data)
+        canonical = system.get_canonical_object(returned)
+        if canonical is not returned:
+            canonical.update_field_cache(data)
+        return canonical
 
     @classmethod
     def bind(cls, system):
@@ -199,6 +213,45 @@ class BaseSystemObject(metaclass=FieldsMeta):
         :returns: a dictionary of field names to their values
         """
 
+        returned = self._get_fields_from_cache_if_possible(
+            field_names, from_cache, fetch_if_not_cached, raw_value
+        )
+        if returned is not NOTHING:
+            return returned
+        response = self.system.api.get(self._get_fields_fetch_query(field_names))
+        return self._get_fields_from_response(response, field_names, raw_value)
+
+    async def get_field_async(self, field_name, **kwargs):
+        """
+        Like :meth:`.get_field`, only fetching the field through the system's
+        :class:`.AsyncAPI`
+        """
+        return (await self.get_fields_async([field_name], **kwargs))[field_name]
+
+    async def get_fields_async(
+        self,
+        field_names=(),
+        from_cache=DONT_CARE,
+        fetch_if_not_cached=True,
+        raw_value=False,
+    ):
+        """
+        Like :meth:`.get_fields`, only fetching the fields through the system's
+        :class:`.AsyncAPI`
+        """
+        returned = self._get_fields_from_cache_if_possible(
+            field_names, from_cache, fetch_if_not_cached, raw_value
+        )
+        if returned is not NOTHING:
+            return returned
+        response = await self.system.async_api.get(
+            self._get_fields_fetch_query(field_names)
+        )
+        return self._get_fields_from_response(response, field_names, raw_value)
+
+    def _get_fields_from_cache_if_possible(
+        self, field_names, from_cache, fetch_if_not_cached, raw_value
+    ):
         from_cache = self._deduce_from_cache(field_names, from_cache)
 
         if from_cache:
@@ -213,7 +266,9 @@ class BaseSystemObject(metaclass=FieldsMeta):
                 return self._get_fields_from_cache(field_names_to_retrieve, raw_value)
             except CacheMiss:
                 pass
+        return NOTHING
 
+    def _get_fields_fetch_query(self, field_names):
         query = self._get_fields_query()
 
         only_fields = []
@@ -225,9 +280,9 @@ class BaseSystemObject(metaclass=FieldsMeta):
 
         if only_fields:
             query = query.add_query_param("fields", ",".join(only_fields))
+        return query
 
-        response = self.system.api.get(query)
-
+    def _get_fields_from_response(self, response, field_names, raw_value):
         result = self._get_fields_result(response)
         self.update_field_cache(result)
 
@@ -307,6 +362,26 @@ class BaseSystemObject(metaclass=FieldsMeta):
         field = self.fields.get_or_fabricate(field_name)
         return self.system.is_field_supported(field)
 
+    def set_prefetched_related_objects(self, related_objects):
+        """
+        .. warning:: for internal use only. Sets the related objects fetched along with this object, as a dictionary
+           of field names to dictionaries of the related objects by their ids
+        """
+        self._prefetched_related_objects = related_objects
+
+    def get_prefetched_related_object(self, field_name, related_id):
+        if self._prefetched_related_objects is None:
+            return None
+        return self._prefetched_related_objects.get(field_name, {}).get(related_id)
+
+    def get_cached_api_value(self, field_name, default=None):
+        """
+        Returns the API value of a field from the cache without fetching it, or ``default`` if it is not cached
+        """
+        return self._cache.get(
+            self.fields.get_or_fabricate(field_name).api_name, default
+        )
+
     def update_field_cache(self, api_obj):
         assert all(isinstance(key, (str, bytes)) for key in api_obj.keys())
         self._cache.update(api_obj)
@@ -431,7 +506,7 @@ class SystemObject(BaseSystemObject):
         )
         try:
             returned = system.api.post(url, data=data).get_result()
-            obj = cls(system, returned)
+            obj = system.get_canonical_object(cls(system, returned))
         except Exception as e:  # pylint: disable=broad-except
             with end_reraise_context():
                 gossip.trigger_with_tags(
@@ -549,9 +624,6 @@ class SystemObject(BaseSystemObject):
         return resp
 
 
-@gossip.register("infinidat.sdk.object_creation_failure")
-@gossip.register("infinidat.sdk.object_deletion_failure")
-@gossip.register("infinidat.sdk.object_update_failure")
 def _notify_operation_failed(system, exception, **kwargs):
     cls = kwargs.pop("cls", None) or type(kwargs.pop("obj"))
     tags = cls.get_tags_for_object_operations(system)
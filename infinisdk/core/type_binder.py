@@ -5,7 +5,46 @@ from sentinels import NOTHING
 from urlobject import URLObject
 
 from .exceptions import InfiniSDKRuntimeException, ObjectNotFound, TooManyObjectsFound
-from .object_query import ObjectQuery, PolymorphicQuery
+from .field_filter import LOCAL_OPERATOR_NAMES, FieldFilter
+from .object_query import CachedQuery, ObjectQuery, PolymorphicQuery
+from .q import QField
+
+# Keeps the (URL-encoded) ``in:`` filters of get_by_ids well below common URL length
+# limits of servers and proxies (about 8KB)
+_MAX_IDS_FILTER_LENGTH = 3000
+_MAX_IDS_PER_QUERY = 1000
+_MAX_PARALLEL_ID_QUERIES = 8
+
+
+def _iter_id_chunks(ids):
+    returned = []
+    filter_length = 0
+    for obj_id in ids:
+        id_length = len(str(obj_id)) + len("%2C")
+        if returned and (
+            len(returned) == _MAX_IDS_PER_QUERY
+            or filter_length + id_length > _MAX_IDS_FILTER_LENGTH
+        ):
+            yield returned
+            returned = []
+            filter_length = 0
+        returned.append(obj_id)
+        filter_length += id_length
+    if returned:
+        yield returned
+
+
+def _are_comparable_types(first, second):
+    return first is second or {first, second} <= {int, float}
+
+
+def _map_id_chunks(api, func, ids):
+    """Calls ``func`` with each chunk of the (deduplicated) ids, sending chunks concurrently"""
+    chunks = list(_iter_id_chunks(list(dict.fromkeys(ids))))
+    if len(chunks) <= 1:
+        return [func(chunk) for chunk in chunks]
+    with api.get_executor(min(_MAX_PARALLEL_ID_QUERIES, len(chunks))) as executor:
+        return list(executor.map(func, chunks))
 
 
 class BaseBinder:
@@ -152,6 +191,8 @@ class MonomorphicBinder(BaseBinder):  # pylint: disable=abstract-method
         super(MonomorphicBinder, self).__init__(system)
         self.object_type = object_type
         self._cache = None
+        self._cache_indexes = None
+        self._cache_value_types = None
 
     def get_by_id(self, id):  # pylint: disable=redefined-builtin
         return self.get(**{self.object_type.UID_FIELD: id})
@@ -171,6 +212,106 @@ class MonomorphicBinder(BaseBinder):  # pylint: disable=abstract-method
     def safe_get_by_id(self, id):  # pylint: disable=redefined-builtin
         return self.safe_get(**{self.object_type.UID_FIELD: id})
 
+    def get_by_ids(self, ids, fields=None):
+        """
+        Obtains several objects by their ids, using as few queries as possible: the ids are
+        split into chunks queried with ``in:`` filters, which are sent concurrently.
+
+        :param fields: if given, only these fields are fetched (see :meth:`.only_fields`)
+        :returns: the objects, in the order of ``ids``. Raises :class:`.ObjectNotFound`
+          listing the ids which could not be found
+        """
+        ids = list(ids)
+        returned = self.safe_get_by_ids(ids, fields=fields)
+        missing_ids = [obj_id for obj_id, obj in zip(ids, returned) if obj is None]
+        if missing_ids:
+            raise ObjectNotFound(
+                "{} with ids {} not found".format(
+                    self.get_name(), ", ".join(str(obj_id) for obj_id in missing_ids)
+                )
+            )
+        return returned
+
+    def safe_get_by_ids(self, ids, fields=None):
+        """
+        Like :meth:`.get_by_ids`, only returning None in place of objects which could not
+        be found
+        """
+        ids = list(ids)
+        if self._cache is not None:
+            return [self._cache.safe_get_by_id_from_cache(obj_id) for obj_id in ids]
+        results = _map_id_chunks(
+            self.system.api, lambda chunk: self._get_objects_by_ids(chunk, fields), ids
+        )
+        objects_by_id = {obj.id: obj for result in results for obj in result}
+        return [objects_by_id.get(obj_id) for obj_id in ids]
+
+    def _get_objects_by_ids(self, ids, fields):
+        uid_field = self.fields[self.object_type.UID_FIELD]
+        query = self.find(uid_field.in_(ids)).page_size(len(ids))
+        if fields is not None:
+            query = query.only_fields(list(fields))
+        return query.to_list()
+
+    def refresh_many(self, objects, field_names=None):
+        """
+        Refreshes the cached fields of several objects, using as few queries as possible:
+        objects are grouped by type, and fetched with ``in:`` filters on their ids in
+        chunks, which are sent concurrently. This replaces a :meth:`.get_fields` call
+        per object, e.g. when polling the capacity of many volumes::
+
+            system.volumes.refresh_many(volumes, ['used_size', 'allocated'])
+
+        :param field_names: the fields to refresh. If not given, all fields are refreshed
+
+        Objects which no longer exist have the requested fields discarded from their
+        cache, so that accessing them queries the system again
+        """
+        objects_by_type = {}
+        for obj in objects:
+            assert obj.system is self.system, "Cannot refresh objects of another system"
+            objects_by_type.setdefault(type(obj), []).append(obj)
+        for object_type, typed_objects in objects_by_type.items():
+            self._refresh_objects_of_type(object_type, typed_objects, field_names)
+
+    def _refresh_objects_of_type(self, object_type, objects, field_names):
+        if object_type is self.object_type:
+            url = URLObject(self.get_url_path())
+        else:
+            url = URLObject(object_type.get_url_path(self.system))
+        uid_field = object_type.fields[object_type.UID_FIELD]
+        if field_names is not None:
+            api_names = {uid_field.api_name}
+            api_names.update(
+                object_type.fields.get_or_fabricate(field_name).api_name
+                for field_name in field_names
+            )
+            url = url.set_query_param("fields", ",".join(sorted(api_names)))
+
+        def fetch_chunk(ids):
+            query = ObjectQuery(self.system, url, object_type).extend_url(
+                uid_field.in_(ids)
+            )
+            chunk_url = query.query.set_query_param("page_size", str(len(ids)))
+            return self.system.api.get(chunk_url).get_result()
+
+        objects_by_id = {}
+        for obj in objects:
+            objects_by_id.setdefault(obj.id, []).append(obj)
+        refreshed_ids = set()
+        for result in _map_id_chunks(self.system.api, fetch_chunk, list(objects_by_id)):
+            for api_obj in result:
+                obj_id = uid_field.binding.get_value_from_api_object(
+                    self.system, object_type, None, api_obj
+                )
+                for obj in objects_by_id.get(obj_id, ()):
+                    obj.update_field_cache(api_obj)
+                refreshed_ids.add(obj_id)
+        for obj_id, missing_objects in objects_by_id.items():
+            if obj_id not in refreshed_ids:
+                for obj in missing_objects:
+                    obj.invalidate_cache(*(field_names or ()))
+
     def get_name(self):
         return self.object_type.get_plural_name()
 
@@ -208,24 +349,141 @@ class MonomorphicBinder(BaseBinder):  # pylint: disable=abstract-method
         .. seealso:: :class:`infinisdk.core.object_query.ObjectQuery`
         """
         if self._cache is not None:
-            assert (
-                not predicates and not kw
-            ), "Custom find() is unsupported when forcing queries from cache"
-            return self._cache
+            if not predicates and not kw:
+                return self._cache
+            filters = self._get_field_filters(predicates, kw)
+            if self._can_find_in_cache(filters):
+                return self._find_in_cache(filters)
         query = ObjectQuery(self.system, self.get_url_path(), self.object_type)
         return query.extend_url(*predicates, **kw)
 
+    def _get_field_filters(self, predicates, kw):
+        returned = []
+        for predicate in predicates:
+            if isinstance(predicate.field, QField):
+                predicate = FieldFilter(
+                    self.fields.get_or_fabricate(predicate.field.name),
+                    predicate.operator_name,
+                    predicate.value,
+                )
+            returned.append(predicate)
+        returned.extend(
+            self.fields.get_or_fabricate(field_name) == value
+            for field_name, value in kw.items()
+        )
+        return returned
+
+    def _can_find_in_cache(self, filters):
+        return all(
+            field_filter.operator_name in LOCAL_OPERATOR_NAMES
+            and self._has_cached_value_type(field_filter)
+            for field_filter in filters
+        )
+
+    def _has_cached_value_type(self, field_filter):
+        """
+        Returns whether the filter's values have the type of the field's cached API values.
+        Values which the field's binding cannot convert (e.g. strings for fields which the
+        object type does not declare) are compared by the system, which parses them from the
+        query string
+        """
+        field_name = field_filter.field.name
+        if field_name not in self._cache_value_types:
+            self._cache_value_types[field_name] = next(
+                (
+                    type(api_value)
+                    for api_value in (
+                        obj.get_cached_api_value(field_name) for obj in self._cache
+                    )
+                    if api_value is not None
+                ),
+                None,
+            )
+        cached_type = self._cache_value_types[field_name]
+        if cached_type is None:
+            return True
+        values = field_filter.get_local_api_value(self.system)
+        if field_filter.operator_name not in ("in", "notin", "between"):
+            values = [values]
+        return all(
+            value is None or _are_comparable_types(type(value), cached_type)
+            for value in values
+        )
+
+    def _find_in_cache(self, filters):
+        candidates = None
+        for field_filter in filters:
+            if field_filter.operator_name != "eq":
+                continue
+            index = self._get_cache_index(field_filter.field)
+            if index is None:
+                continue
+            try:
+                matching = index.get(field_filter.get_local_api_value(self.system), [])
+            except TypeError:  # unhashable value
+                continue
+            if candidates is None or len(matching) < len(candidates):
+                candidates = matching
+        if candidates is None:
+            candidates = self._cache
+        matchers = [
+            (field_filter.field.name, field_filter.get_local_matcher(self.system))
+            for field_filter in filters
+        ]
+        return CachedQuery(
+            [
+                obj
+                for obj in candidates
+                if all(
+                    matcher(obj.get_cached_api_value(field_name))
+                    for field_name, matcher in matchers
+                )
+            ],
+            " & ".join(str(field_filter) for field_filter in filters),
+        )
+
+    def _get_cache_index(self, field):
+        """
+        Returns a dictionary of the objects in the cache by their API value of the field, or
+        None if its values cannot be indexed
+        """
+        if field.name not in self._cache_indexes:
+            index = {}
+            try:
+                for obj in self._cache:
+                    index.setdefault(obj.get_cached_api_value(field.name), []).append(
+                        obj
+                    )
+            except TypeError:  # unhashable values, e.g. lists
+                index = None
+            self._cache_indexes[field.name] = index
+        return self._cache_indexes[field.name]
+
     @contextmanager
     def fetch_once_context(self):
+        """
+        Fetches the entire collection once, and serves queries of this binder from it while
+        in the context. Queries with filters are evaluated on the fetched objects, using
+        indexes built on first use for equality filters, so repeated lookups such as
+        ``get(name=...)`` do not send API requests. The indexes reflect the field values at the
+        time they were built. Filters with operators which cannot be evaluated locally
+        (e.g. ``like``) are still sent to the system
+        """
         original_cache = self._cache
+        original_indexes = self._cache_indexes
+        original_value_types = self._cache_value_types
         try:
             if original_cache is None:
                 self._cache = self.get_all()
                 for _ in self._cache:
                     pass
+                self._cache_indexes = {}
+                self._cache_value_types = {}
             yield
         finally:
             self._cache = original_cache
+            self._cache_indexes = original_indexes
+            self._cache_value_types = original_value_types
 
 
 class TypeBinder(MonomorphicBinder):
@@ -1,51 +1,106 @@
+import threading
+
+
 class TypeBinderContainer:
     """
     Contains several type binders with a common characteristic. Used to implement system.objects and similar facilities
+
+    Installing a type only registers it; its binder is created on first access, since most programs only use a few of
+    the installed types
     """
 
     def __init__(self, system):
         super(TypeBinderContainer, self).__init__()
         self.system = system
+        self._lock = threading.Lock()
+        self._types_by_name = {}
+        self._types_by_type_name = {}
         self._binders_by_class = {}
-        self._binders_by_name = {}
-        self._binders_by_type_name = {}
 
     def install(self, object_type):
-        binder = object_type.bind(self.system)
-        self._binders_by_class[object_type] = binder
-        self._binders_by_name[object_type.get_plural_name()] = binder
-        self._binders_by_type_name[object_type.get_type_name()] = binder
-        assert not hasattr(self.system, object_type.get_plural_name())
-        setattr(self.system, object_type.get_plural_name(), binder)
+        plural_name = object_type.get_plural_name()
+        system_type = type(self.system)
+        getter = getattr(system_type, plural_name, None)
+        if getter is None:
+            getter = TypeBinderGetter(plural_name)
+            setattr(system_type, plural_name, getter)
+        assert isinstance(getter, TypeBinderGetter)
+        assert plural_name not in self._types_by_name
+        assert plural_name not in vars(self.system)
+        self._types_by_name[plural_name] = object_type
+        self._types_by_type_name[object_type.get_type_name()] = object_type
+
+    def _get_binder(self, object_type):
+        returned = self._binders_by_class.get(object_type)
+        if returned is None:
+            with self._lock:
+                returned = self._binders_by_class.get(object_type)
+                if returned is None:
+                    returned = self._binders_by_class[object_type] = object_type.bind(
+                        self.system
+                    )
+        return returned
 
     def __getattr__(self, attr):
         """
         Gets a type binder given its name
         """
         try:
-            return self._binders_by_name[attr]
+            object_type = self._types_by_name[attr]
         except LookupError as e:
             raise AttributeError(attr) from e
+        return self._get_binder(object_type)
 
     def __getitem__(self, name):
         """
         Gets a type binder given its name
         """
         if isinstance(name, (str, bytes)):
-            return self._binders_by_name[name]
-        return self._binders_by_class[name]
+            return self._get_binder(self._types_by_name[name])
+        if name not in self._types_by_type_name.values():
+            raise KeyError(name)
+        return self._get_binder(name)
 
     def __dir__(self):
-        return dir(type(self)) + list(self.__dict__) + list(self._binders_by_name)
+        return dir(type(self)) + list(self.__dict__) + list(self._types_by_name)
 
     def __iter__(self):
-        return iter(self._binders_by_name.values())
+        return iter(
+            [
+                self._get_binder(object_type)
+                for object_type in self._types_by_name.values()
+            ]
+        )
 
     def __len__(self):
-        return len(self._binders_by_name)
+        return len(self._types_by_name)
 
     def get_types(self):
-        return list(self._binders_by_class)
+        return list(self._types_by_name.values())
 
     def get_binder_by_type_name(self, type_name):
-        return self._binders_by_type_name.get(type_name)
+        object_type = self._types_by_type_name.get(type_name)
+        if object_type is None:
+            return None
+        return self._get_binder(object_type)
+
+
+class TypeBinderGetter:
+    """
+    Returns the binder of a type installed in ``system.objects``, and stores it on the system so that later accesses
+    are plain attribute lookups
+    """
+
+    def __init__(self, plural_name):
+        super(TypeBinderGetter, self).__init__()
+        self.plural_name = plural_name
+
+    def __get__(self, system, _):
+        if system is None:
+            return self
+        try:
+            returned = system.objects[self.plural_name]
+        except KeyError as e:
+            raise AttributeError(self.plural_name) from e
+        setattr(system, self.plural_name, returned)
+        return returned
@@ -1,7 +1,8 @@
 # pylint: disable=unused-import
 from sentinels import Sentinel
 
-from .python import end_reraise_context
+from .logs import is_trace_enabled
+from .python import end_reraise_context, lazy_attribute
 from .query_utils import (
     add_comma_separated_query_param,
     add_normalized_query_params,
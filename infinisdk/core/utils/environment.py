@@ -1,6 +1,5 @@
 import os
 
-import pkg_resources
 from mitba import cached_function
 
 
@@ -27,6 +26,8 @@ def get_hostname():
 
 @cached_function
 def get_infinisdk_version():
+    import pkg_resources
+
     try:
         return pkg_resources.get_distribution(
             "infinisdk"
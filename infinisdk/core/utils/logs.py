@@ -0,0 +1,18 @@
+from itertools import chain
+
+from logbook import TRACE, Handler
+
+
+def is_trace_enabled(logger):
+    """Returns whether a TRACE record emitted by ``logger`` would reach any handler.
+
+    This is meant to skip formatting work (decoding, pretty-printing) when nobody
+    records the result. It errs on the side of True when filters are involved
+    """
+    if logger.disabled or logger.level > TRACE:
+        return False
+    for handler in chain(logger.handlers, Handler.stack_manager.iter_context_objects()):
+        if handler.level > TRACE:
+            continue
+        return not (handler.blackhole and handler.filter is None)
+    return False
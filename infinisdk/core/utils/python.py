@@ -1,4 +1,5 @@
 import sys
+import threading
 from contextlib import contextmanager
 
 
@@ -21,3 +22,40 @@ def end_reraise_context():
     exc_info = sys.exc_info()
     yield
     reraise(*exc_info)
+
+
+class lazy_attribute:  # pylint: disable=invalid-name
+    """
+    Like a read-only property, only computed once on first access and then stored on the
+    instance, so later accesses are plain attribute lookups. Concurrent first accesses
+    from several threads compute the value only once. Each instance has its own lock, so
+    a slow computation only blocks the first accesses of the same instance
+    """
+
+    _LOCK_ATTRIBUTE_NAME = "_lazy_attributes_lock"
+    _instance_locks_lock = threading.Lock()
+
+    def __init__(self, func):
+        super(lazy_attribute, self).__init__()
+        self._func = func
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+
+    def _get_instance_lock(self, instance):
+        returned = instance.__dict__.get(self._LOCK_ATTRIBUTE_NAME)
+        if returned is None:
+            with self._instance_locks_lock:
+                returned = instance.__dict__.get(self._LOCK_ATTRIBUTE_NAME)
+                if returned is None:
+                    returned = threading.RLock()
+                    instance.__dict__[self._LOCK_ATTRIBUTE_NAME] = returned
+        return returned
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        with self._get_instance_lock(instance):
+            returned = instance.__dict__.get(self.__name__, self)
+            if returned is self:
+                returned = instance.__dict__[self.__name__] = self._func(instance)
+        return returned
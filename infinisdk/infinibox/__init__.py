@@ -1 +1,13 @@
+import gossip
+
+from ..core.system_object import _notify_operation_failed
 from .infinibox import InfiniBox
+
+# Registered only now, since validating registrations computes the tags of the object hooks,
+# which requires InfiniBox (see infinisdk._LazyTagNames)
+for _hook_name in (
+    "object_creation_failure",
+    "object_deletion_failure",
+    "object_update_failure",
+):
+    gossip.register(_notify_operation_failed, "infinidat.sdk.{}".format(_hook_name))
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from logbook import Logger
+
+_logger = Logger(__name__)
+
+_FORMAT_VERSION = 1
+
+
+class BootstrapCache:
+    """
+    Persists the information fetched when starting to work with a system (its version
+    and API features) between processes, keyed by the system's API addresses. Entries
+    record the serial number and version they were fetched for, so they can be
+    validated once the system is reached, and expire after ``ttl_seconds``
+    """
+
+    def __init__(self, directory, ttl_seconds):
+        super(BootstrapCache, self).__init__()
+        self.directory = os.path.expanduser(directory)
+        self.ttl_seconds = ttl_seconds
+
+    def _get_path(self, urls):
+        key = hashlib.sha1("\n".join(sorted(str(url) for url in urls)).encode("utf-8"))
+        return os.path.join(self.directory, "{}.json".format(key.hexdigest()))
+
+    def load(self, urls):
+        """Returns a fresh entry for the system with the given API URLs, or None"""
+        path = self._get_path(urls)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _logger.debug("Ignoring unreadable bootstrap cache {}: {}", path, e)
+            return None
+        if entry.get("format_version") != _FORMAT_VERSION:
+            return None
+        if time.time() - entry.get("saved_at", 0) > self.ttl_seconds:
+            return None
+        return entry
+
+    def save(self, urls, serial, version, features):
+        path = self._get_path(urls)
+        entry = {
+            "format_version": _FORMAT_VERSION,
+            "saved_at": time.time(),
+            "serial": serial,
+            "version": version,
+            "features": features,
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError as e:
+            _logger.debug("Could not save bootstrap cache {}: {}", path, e)
+            return
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            _logger.debug("Could not save bootstrap cache {}: {}", path, e)
+            os.remove(temp_path)
+
+    def invalidate(self, urls):
+        try:
+            os.remove(self._get_path(urls))
+        except FileNotFoundError:
+            pass
@@ -1,9 +1,13 @@
 import operator
 from http import client as httplib
 
+from logbook import Logger
 from sentinels import NOTHING
 
 from ..core.config import config
+from .bootstrap_cache import BootstrapCache
+
+_logger = Logger(__name__)
 
 
 class Feature:
@@ -25,10 +29,16 @@ class Compatibility:
         self.system = system
         self._features = None
         self._system_version = None
+        self._features_list = None
+        self._bootstrap_entry = None
+        self._tried_bootstrap_cache = False
+        self._validated_bootstrap_cache = False
 
     def invalidate_cache(self):
         self._features = None
         self._system_version = None
+        self._features_list = None
+        self._bootstrap_entry = None
 
     def is_initialized(self):
         return self._features is not None
@@ -37,8 +47,72 @@ class Compatibility:
         if not self.is_initialized():
             self._init_features()
 
+    def _get_bootstrap_cache(self):
+        cache_config = config.root.infinibox.bootstrap_cache
+        if not cache_config.enabled:
+            return None
+        return BootstrapCache(cache_config.directory, cache_config.ttl_seconds)
+
+    def _try_load_bootstrap_cache(self):
+        if self._tried_bootstrap_cache:
+            return
+        self._tried_bootstrap_cache = True
+        bootstrap_cache = self._get_bootstrap_cache()
+        if bootstrap_cache is None:
+            return
+        entry = bootstrap_cache.load(self.system.api.urls)
+        if entry is None:
+            return
+        self._bootstrap_entry = entry
+        self._set_features(entry["features"])
+        self._system_version = self.normalize_version_string(entry["version"])
+
+    def _get_version_string(self):
+        self._try_load_bootstrap_cache()
+        if self._bootstrap_entry is not None:
+            return self._bootstrap_entry["version"]
+        return self.system.get_version()
+
+    def needs_bootstrap_cache_validation(self):
+        """Returns whether bootstrap information was loaded from the disk, and was not
+        compared with the system yet
+        """
+        return self._bootstrap_entry is not None and not self._validated_bootstrap_cache
+
+    def validate_bootstrap_cache(self):
+        """Compares the bootstrap information loaded from the disk with the system, once
+        its serial number and version are known, and saves it for future processes.
+        This is done after logging in, or after the first successful request of a system
+        which did not log in explicitly
+        """
+        bootstrap_cache = self._get_bootstrap_cache()
+        if bootstrap_cache is None:
+            return
+        self._validated_bootstrap_cache = True
+        # Right after login the fields are already cached; otherwise fetch both at once
+        fields = self.system.components.system_component.get_fields(
+            ["serial_number", "version"], from_cache=True, fetch_if_not_cached=True
+        )
+        serial, version = fields["serial_number"], fields["version"]
+        entry = self._bootstrap_entry
+        if entry is not None:
+            if entry["serial"] == serial and entry["version"] == version:
+                return
+            _logger.debug(
+                "Discarding stale bootstrap cache of {} (serial {}, version {})",
+                self.system,
+                entry["serial"],
+                entry["version"],
+            )
+            self.invalidate_cache()
+            # The version was checked against the stale entry
+            self.system.api.mark_version_unchecked()
+        if self._features_list is None:
+            self._init_features()
+        bootstrap_cache.save(self.system.api.urls, serial, version, self._features_list)
+
     def can_run_on_system(self):
-        version_string = self.system.get_version().split("-", 1)[0]
+        version_string = self._get_version_string().split("-", 1)[0]
         system_version = self.normalize_version_string(version_string)
         restrictions = self._parse_restrictions(
             config.root.infinibox.compatible_versions
@@ -64,24 +138,31 @@ class Compatibility:
     def get_parsed_system_version(self):
         if self._system_version is None:
             self._system_version = self.normalize_version_string(
-                self.system.get_version()
+                self._get_version_string()
             )
         return self._system_version
 
     def get_version_major(self):
-        return self.system.get_version().partition(".")[0]
+        return self._get_version_string().partition(".")[0]
 
     def get_version_as_float(self):
         version_tuple = self.get_parsed_system_version().version[:2]
         return float(".".join(str(num) for num in version_tuple))
 
     def _init_features(self):
+        self._try_load_bootstrap_cache()
+        if self._features is not None:
+            return
         resp = self.system.api.get("_features", assert_success=False)
         if resp.response.status_code == httplib.NOT_FOUND:
             features_list = []  # Backwards compatible
         else:
             resp.assert_success()
             features_list = resp.get_result()
+        self._set_features(features_list)
+
+    def _set_features(self, features_list):
+        self._features_list = features_list
         self._features = dict(
             (
                 feature_info["name"],
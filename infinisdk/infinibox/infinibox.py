@@ -12,6 +12,7 @@ from ..core.api import OMIT, APITarget
 from ..core.config import config, get_ini_option
 from ..core.exceptions import CacheMiss, VersionNotSupported
 from ..core.object_query import LazyQuery
+from ..core.utils import lazy_attribute
 from ..core.utils.environment import (
     get_hostname,
     get_infinisdk_version,
@@ -118,16 +119,44 @@ class InfiniBox(APITarget):
 
     def _initialize(self):
         super(InfiniBox, self)._initialize()
-        self.current_user = _CurrentUserProxy(self)
-        self.compat = Compatibility(self)
-        self.capacities = InfiniBoxSystemCapacity(self)
-        self.system_metadata = SystemMetadata(self)
         self._related_systems = []
-        self.datasets = Datasets(self)
-        self.san_clients = SanClients(self)
-        self.kms = Kms(self)
-        self.certificates = Certificates(self)
-        self.active_directory_domains = ActiveDirectoryDomains(self)
+
+    # Helpers are created on first access, as most programs only use a few of them
+    @lazy_attribute
+    def current_user(self):
+        return _CurrentUserProxy(self)
+
+    @lazy_attribute
+    def compat(self):
+        return Compatibility(self)
+
+    @lazy_attribute
+    def capacities(self):
+        return InfiniBoxSystemCapacity(self)
+
+    @lazy_attribute
+    def system_metadata(self):
+        return SystemMetadata(self)
+
+    @lazy_attribute
+    def datasets(self):
+        return Datasets(self)
+
+    @lazy_attribute
+    def san_clients(self):
+        return SanClients(self)
+
+    @lazy_attribute
+    def kms(self):
+        return Kms(self)
+
+    @lazy_attribute
+    def certificates(self):
+        return Certificates(self)
+
+    @lazy_attribute
+    def active_directory_domains(self):
+        return ActiveDirectoryDomains(self)
 
     def check_version(self):
         if not self.compat.can_run_on_system():
@@ -311,6 +340,7 @@ class InfiniBox(APITarget):
 
     def _after_login(self):
         self.components.system_component.refresh_cache()
+        self.compat.validate_bootstrap_cache()
 
         gossip.trigger("infinidat.sdk.after_login", system=self)
 
@@ -324,6 +354,7 @@ class InfiniBox(APITarget):
             login_data["clientid"] = self._get_client_id()
         res = self.api.post("users/login", data=login_data)
         self.api.mark_logged_in()
+        self.api.save_session()
         self._after_login()
         return res
 
@@ -342,6 +373,7 @@ class InfiniBox(APITarget):
         Logs out the current user
         """
         returned = self.api.post("users/logout", data={})
+        self.api.discard_saved_session()
         self.api.mark_not_logged_in()
         self.api.clear_cookies()
         return returned
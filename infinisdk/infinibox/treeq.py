@@ -150,6 +150,9 @@ class TreeQ(SystemObject):
     def get_unique_key(self):
         return (self.system, type(self).__name__, self.get_filesystem(), self.id)
 
+    def get_identity_map_key(self):
+        return (type(self).__name__, self._binder.get_filesystem().id, self.id)
+
     @classmethod
     def create(cls, system, binder, **fields):  # pylint: disable=arguments-differ
         hook_tags = cls.get_tags_for_object_operations(system)